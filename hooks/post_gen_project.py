@@ -126,16 +126,36 @@ def remove_packagejson_file():
 def remove_celery_files():
     """
     removes celery files in a specific location, including `config/celery_app.py`,
-    `{{ cookiecutter.project_slug }}/users/tasks.py`, and `{{ cookiecutter.project_slug
-    }}/users/tests/test_tasks.py`.
+    `{{ cookiecutter.project_slug }}/users/tasks.py`, the `benchmark_celery` command,
+    `utils/batching.py`, the beat scheduler in `utils/beat.py`, `utils/idempotency.py`
+    and their tests.
 
     """
     file_names = [
         os.path.join("config", "celery_app.py"),
         os.path.join("{{ cookiecutter.project_slug }}", "users", "tasks.py"),
+        os.path.join(
+            "{{ cookiecutter.project_slug }}",
+            "users",
+            "management",
+            "commands",
+            "benchmark_celery.py",
+        ),
         os.path.join(
             "{{ cookiecutter.project_slug }}", "users", "tests", "test_tasks.py"
         ),
+        os.path.join("{{ cookiecutter.project_slug }}", "utils", "batching.py"),
+        os.path.join("{{ cookiecutter.project_slug }}", "utils", "beat.py"),
+        os.path.join("{{ cookiecutter.project_slug }}", "utils", "idempotency.py"),
+        os.path.join(
+            "{{ cookiecutter.project_slug }}", "utils", "tests", "test_batching.py"
+        ),
+        os.path.join(
+            "{{ cookiecutter.project_slug }}", "utils", "tests", "test_beat.py"
+        ),
+        os.path.join(
+            "{{ cookiecutter.project_slug }}", "utils", "tests", "test_idempotency.py"
+        ),
     ]
     for file_name in file_names:
         os.remove(file_name)
@@ -530,6 +550,19 @@ def remove_drf_starter_files():
     """
     os.remove(os.path.join("config", "api_router.py"))
     shutil.rmtree(os.path.join("{{cookiecutter.project_slug}}", "users", "api"))
+    for file_name in ["test_drf_authentication.py", "test_drf_views.py"]:
+        os.remove(
+            os.path.join("{{cookiecutter.project_slug}}", "users", "tests", file_name)
+        )
+    os.remove(
+        os.path.join(
+            "{{cookiecutter.project_slug}}",
+            "users",
+            "management",
+            "commands",
+            "benchmark_token_auth.py",
+        )
+    )
 
 
 def main():
@@ -1,5 +1,13 @@
+import gc
+import logging
 import os
-from celery import Celery
+import time
+from typing import Optional, Tuple
+
+from celery import Celery, signals
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger(__name__)
 
 # set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
@@ -14,3 +22,139 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 
 # Load task modules from all registered Django app configs.
 app.autodiscover_tasks()
+
+# Task metrics, served by the worker on CELERY_WORKER_METRICS_PORT. Prefork
+# children share them through files in $prometheus_multiproc_dir, see
+# compose/production/django/celery/worker/start.
+QUEUE_WAIT = Histogram(
+    "celery_task_queue_wait_seconds",
+    "Time from sending a task to a worker starting it.",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, float("inf")),
+)
+RUNTIME = Histogram(
+    "celery_task_runtime_seconds",
+    "Time tasks took to run, including failed runs.",
+    ["task"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, float("inf")),
+)
+RETRIES = Counter("celery_task_retries_total", "Tasks retried.", ["task"])
+FAILURES = Counter("celery_task_failures_total", "Tasks failed.", ["task"])
+
+# perf_counter() at which each running task started, by task ID.
+_started = {}
+# When this (pool) process started, and whether it ran a task since.
+_process = {"started": time.perf_counter(), "ran_task": False}
+
+
+@signals.before_task_publish.connect
+def stamp_sent_at(headers=None, **kwargs):
+    # Wall clock time, as the worker may run on another host.
+    headers.setdefault("sent_at", time.time())
+
+
+@signals.task_prerun.connect
+def record_queue_wait(task_id=None, task=None, **kwargs):
+    sent_at = getattr(task.request, "sent_at", None)
+    # Not for retries, whose wait includes the countdown.
+    if sent_at is not None and not task.request.retries:
+        QUEUE_WAIT.labels(task.name).observe(max(0.0, time.time() - sent_at))
+    _started[task_id] = time.perf_counter()
+
+
+@signals.task_postrun.connect
+def record_runtime(task_id=None, task=None, **kwargs):
+    started = _started.pop(task_id, None)
+    if started is None:
+        return
+    runtime = time.perf_counter() - started
+    RUNTIME.labels(task.name).observe(runtime)
+    if not _process["ran_task"]:
+        report_first_task(runtime)
+
+
+@signals.task_retry.connect
+def count_retry(sender=None, **kwargs):
+    RETRIES.labels(sender.name).inc()
+
+
+@signals.task_failure.connect
+def count_failure(sender=None, **kwargs):
+    FAILURES.labels(sender.name).inc()
+
+
+@signals.worker_init.connect
+def serve_metrics(**kwargs):
+    from django.conf import settings
+    from prometheus_client import start_http_server
+
+    from {{ cookiecutter.project_slug }}.utils.metrics import get_registry
+
+    if settings.CELERY_WORKER_METRICS_PORT:
+        start_http_server(settings.CELERY_WORKER_METRICS_PORT, registry=get_registry())
+
+
+@signals.worker_init.connect
+def preload(**kwargs):
+    """
+    Load what tasks need in the worker before it forks its pool, so the
+    children share it copy-on-write instead of each importing it on its
+    first task.
+    """
+    import django
+    from django.apps import apps
+    from django.conf import settings
+    from django.db import connections
+    from django.template import engines
+    from django.urls import get_resolver
+
+    if not settings.CELERY_WORKER_PRELOAD:
+        return
+    if not apps.ready:
+        django.setup()
+    # Imports every view, and the template tag libraries of every app.
+    get_resolver().reverse_dict
+    engines.all()
+    connections.all()
+    # Children must not share the parent's connections; Celery's Django fixup
+    # also drops any left in worker_process_init.
+    connections.close_all()
+    # Keep the collector from touching (and so copying) what is loaded so far.
+    gc.freeze()  # type: ignore
+
+
+@signals.worker_process_init.connect
+def record_process_start(**kwargs):
+    _process.update(started=time.perf_counter(), ran_task=False)
+
+
+def report_first_task(runtime: float):
+    # Compare with CELERY_WORKER_PRELOAD off to see what preloading saves.
+    _process["ran_task"] = True
+    memory = memory_usage()
+    logger.info(
+        "Process %d ran its first task in %.3fs, %.3fs after starting; "
+        "RSS %s MiB, private %s MiB",
+        os.getpid(),
+        runtime,
+        time.perf_counter() - _process["started"],
+        *(memory or ("n/a", "n/a")),
+    )
+
+
+def memory_usage() -> Optional[Tuple[float, float]]:
+    """
+    This process's resident memory and the part of it not shared with other
+    processes, in MiB; None where /proc/self/smaps_rollup is missing.
+    """
+    try:
+        with open("/proc/self/smaps_rollup") as smaps:
+            fields = {
+                line.split()[0]: int(line.split()[1])
+                for line in smaps
+                if line.split()[0].endswith(":")
+            }
+    except OSError:
+        return None
+    private = fields["Private_Clean:"] + fields["Private_Dirty:"]
+    return round(fields["Rss:"] / 1024, 1), round(private / 1024, 1)
@@ -0,0 +1,17 @@
+"""
+gunicorn settings, used with ``gunicorn --config config/gunicorn.py``.
+
+The start commands export ``prometheus_multiproc_dir`` for the workers to share
+Prometheus metrics through, see {{ cookiecutter.project_slug }}/utils/metrics.py.
+"""
+import os
+
+
+def child_exit(server, worker):
+    if "prometheus_multiproc_dir" in os.environ:
+        # Imported here: prometheus_client picks its value class on import, and
+        # the workers rather than the master must be the first to import it.
+        from prometheus_client import multiprocess
+
+        # Drop the dead worker's gauges; its counters and histograms are kept.
+        multiprocess.mark_process_dead(worker.pid)
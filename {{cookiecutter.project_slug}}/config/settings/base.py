@@ -76,6 +76,9 @@ THIRD_PARTY_APPS = [
     "allauth.account",
     "allauth.socialaccount",
     "rest_framework",
+{%- if cookiecutter.use_drf == "y" %}
+    "rest_framework.authtoken",
+{%- endif %}
 {%- if cookiecutter.use_celery == 'y' %}
     "django_celery_beat",
 {%- endif %}
@@ -100,6 +103,12 @@ AUTHENTICATION_BACKENDS = [
     "django.contrib.auth.backends.ModelBackend",
     "allauth.account.auth_backends.AuthenticationBackend",
 ]
+# Seconds CachedAuthenticationMiddleware keeps a loaded request.user cached.
+USER_CACHE_TIMEOUT = env.int("DJANGO_USER_CACHE_TIMEOUT", default=60)
+# Seconds between writes of buffered last_login/last_seen timestamps.
+USER_ACTIVITY_FLUSH_INTERVAL = env.int(
+    "DJANGO_USER_ACTIVITY_FLUSH_INTERVAL", default=60
+)
 # https://docs.djangoproject.com/en/dev/ref/settings/#auth-user-model
 AUTH_USER_MODEL = "users.User"
 # https://docs.djangoproject.com/en/dev/ref/settings/#login-redirect-url
@@ -112,11 +121,23 @@ LOGIN_URL = "account_login"
 # https://docs.djangoproject.com/en/dev/ref/settings/#password-hashers
 PASSWORD_HASHERS = [
     # https://docs.djangoproject.com/en/dev/topics/auth/passwords/#using-argon2-with-django
-    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "{{cookiecutter.project_slug}}.users.hashers.ProfiledArgon2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
     "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
 ]
+# Argon2 cost parameters used by ProfiledArgon2PasswordHasher. Higher costs
+# resist offline cracking better but take more CPU and memory per login;
+# benchmark with `manage.py benchmark_password_hashing` before switching.
+# https://argon2-cffi.readthedocs.io/en/stable/parameters.html
+ARGON2_PROFILES = {
+    "low": {"time_cost": 1, "memory_cost": 256, "parallelism": 1},
+    # Django's own Argon2PasswordHasher defaults
+    "default": {"time_cost": 2, "memory_cost": 512, "parallelism": 2},
+    # RFC 9106's recommendation for memory-constrained environments
+    "high": {"time_cost": 3, "memory_cost": 65536, "parallelism": 4},
+}
+PASSWORD_HASHER_PROFILE = env("DJANGO_PASSWORD_HASHER_PROFILE", default="default")
 # https://docs.djangoproject.com/en/dev/ref/settings/#auth-password-validators
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -131,6 +152,9 @@ AUTH_PASSWORD_VALIDATORS = [
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    "{{cookiecutter.project_slug}}.utils.metrics.RequestMetricsMiddleware",
+    "{{cookiecutter.project_slug}}.utils.log.RequestContextMiddleware",
+    "{{cookiecutter.project_slug}}.utils.profiler.ProfilerMiddleware",
     "django.middleware.security.SecurityMiddleware",
 {%- if cookiecutter.use_whitenoise == 'y' %}
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -139,7 +163,8 @@ MIDDLEWARE = [
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "{{cookiecutter.project_slug}}.users.middleware.CachedAuthenticationMiddleware",
+    "{{cookiecutter.project_slug}}.users.middleware.LastSeenMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.common.BrokenLinkEmailsMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
@@ -223,9 +248,15 @@ X_FRAME_OPTIONS = "DENY"
 # EMAIL
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
-EMAIL_BACKEND = env(
-    "DJANGO_EMAIL_BACKEND", default="django.core.mail.backends.smtp.EmailBackend"
+EMAIL_BACKEND = "{{cookiecutter.project_slug}}.utils.mail.AsyncEmailBackend"
+# The backend AsyncEmailBackend delivers queued mail with.
+ASYNC_EMAIL_BACKEND = env(
+    "DJANGO_EMAIL_BACKEND",
+    # Django's SMTP backend reusing connections, see utils/mail.py.
+    default="{{cookiecutter.project_slug}}.utils.mail.PooledSMTPEmailBackend",
 )
+# SMTP connections PooledSMTPEmailBackend keeps open per process.
+EMAIL_POOL_SIZE = env.int("DJANGO_EMAIL_POOL_SIZE", default=4)
 # https://docs.djangoproject.com/en/2.2/ref/settings/#email-timeout
 EMAIL_TIMEOUT = 5
 
@@ -246,6 +277,10 @@ MANAGERS = ADMINS
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "filters": {
+        # Adds request_id, user_id and elapsed to records, see utils/log.py.
+        "request_context": {"()": "{{cookiecutter.project_slug}}.utils.log.RequestContextFilter"}
+    },
     "formatters": {
         "verbose": {
             "format": "%(levelname)s %(asctime)s %(module)s "
@@ -257,9 +292,15 @@ LOGGING = {
             "level": "DEBUG",
             "class": "logging.StreamHandler",
             "formatter": "verbose",
-        }
+        },
+        # Hands records to "console" from a thread of its own, see utils/log.py.
+        "queue": {
+            "class": "{{cookiecutter.project_slug}}.utils.log.QueueHandler",
+            "handlers": ["cfg://handlers.console"],
+            "filters": ["request_context"],
+        },
     },
-    "root": {"level": "INFO", "handlers": ["console"]},
+    "root": {"level": "INFO", "handlers": ["queue"]},
 }
 
 {% if cookiecutter.use_celery == 'y' -%}
@@ -272,20 +313,63 @@ if USE_TZ:
 CELERY_BROKER_URL = env("CELERY_BROKER_URL")
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#std:setting-result_backend
 CELERY_RESULT_BACKEND = CELERY_BROKER_URL
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#task-ignore-result
+# Opt in per task with @celery_app.task(ignore_result=False).
+CELERY_TASK_IGNORE_RESULT = True
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#result-expires
+CELERY_RESULT_EXPIRES = env.int("CELERY_RESULT_EXPIRES", default=60 * 60)
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#std:setting-accept_content
-CELERY_ACCEPT_CONTENT = ["json"]
+# The serializers workers accept, so never pickle. Both are accepted to allow
+# switching CELERY_TASK_SERIALIZER without a coordinated restart.
+CELERY_ACCEPT_CONTENT = ["json", "msgpack"]
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#std:setting-task_serializer
-CELERY_TASK_SERIALIZER = "json"
+# "json" or the more compact and faster "msgpack".
+CELERY_TASK_SERIALIZER = env("CELERY_TASK_SERIALIZER", default="json")
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#std:setting-result_serializer
-CELERY_RESULT_SERIALIZER = "json"
+CELERY_RESULT_SERIALIZER = CELERY_TASK_SERIALIZER
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#task-time-limit
 # TODO: set to whatever value is adequate in your circumstances
 CELERY_TASK_TIME_LIMIT = 5 * 60
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#task-soft-time-limit
 # TODO: set to whatever value is adequate in your circumstances
 CELERY_TASK_SOFT_TIME_LIMIT = 60
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#task-acks-late
+# Acknowledge after running, so a task is redelivered if its worker dies.
+CELERY_TASK_ACKS_LATE = True
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#worker-prefetch-multiplier
+# Per worker profile, see compose/production/django/celery/worker/start.
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#task-default-queue
+CELERY_TASK_DEFAULT_QUEUE = "io"
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#task-routes
+# Queues are consumed by the matching worker profile (io, cpu or email).
+CELERY_TASK_ROUTES = {
+    "{{cookiecutter.project_slug}}.users.tasks.get_users_count": {"queue": "io"},
+    "{{cookiecutter.project_slug}}.users.tasks.flush_user_activity": {"queue": "io"},
+    # Waits on COUNT queries rather than using CPU, like the other database tasks.
+    "{{cookiecutter.project_slug}}.users.tasks.reconcile_user_statistics": {"queue": "io"},
+    "{{cookiecutter.project_slug}}.users.tasks.send_email_messages": {"queue": "email"},
+    "{{cookiecutter.project_slug}}.utils.batching.flush_batch": {"queue": "io"},
+}
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#beat-scheduler
-CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+CELERY_BEAT_SCHEDULER = "{{cookiecutter.project_slug}}.utils.beat:CachedDatabaseScheduler"
+# Most seconds a crontab beat entry runs late, see utils/beat.py.
+CELERY_BEAT_CRONTAB_JITTER = env.int("CELERY_BEAT_CRONTAB_JITTER", default=30)
+# Port workers serve Prometheus task metrics on, 0 for none; see config/celery_app.py.
+CELERY_WORKER_METRICS_PORT = env.int("CELERY_WORKER_METRICS_PORT", default=0)
+# Set Django up in the worker before it forks its pool, see config/celery_app.py.
+CELERY_WORKER_PRELOAD = env.bool("CELERY_WORKER_PRELOAD", default=True)
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#beat-schedule
+CELERY_BEAT_SCHEDULE = {
+    "reconcile-user-statistics": {
+        "task": "{{cookiecutter.project_slug}}.users.tasks.reconcile_user_statistics",
+        "schedule": 60 * 60,
+    },
+    "flush-user-activity": {
+        "task": "{{cookiecutter.project_slug}}.users.tasks.flush_user_activity",
+        "schedule": USER_ACTIVITY_FLUSH_INTERVAL or 60,
+    },
+}
 
 {%- endif %}
 # django-allauth
@@ -301,6 +385,33 @@ ACCOUNT_EMAIL_VERIFICATION = "mandatory"
 ACCOUNT_ADAPTER = "{{cookiecutter.project_slug}}.users.adapters.AccountAdapter"
 # https://django-allauth.readthedocs.io/en/latest/configuration.html
 SOCIALACCOUNT_ADAPTER = "{{cookiecutter.project_slug}}.users.adapters.SocialAccountAdapter"
+
+# Rate limiting
+# ------------------------------------------------------------------------------
+# Token bucket rates, "<requests>/<s|m|h|d>", see utils/ratelimit.py.
+LOGIN_RATE_LIMIT_PER_IP = env("DJANGO_LOGIN_RATE_LIMIT_PER_IP", default="30/m")
+LOGIN_RATE_LIMIT_PER_ACCOUNT = env("DJANGO_LOGIN_RATE_LIMIT_PER_ACCOUNT", default="5/m")
+SIGNUP_RATE_LIMIT_PER_IP = env("DJANGO_SIGNUP_RATE_LIMIT_PER_IP", default="10/h")
+# Reverse proxies trusted to append the client's address to X-Forwarded-For.
+RATELIMIT_NUM_PROXIES = env.int("DJANGO_RATELIMIT_NUM_PROXIES", default=0)
+
+# Metrics
+# ------------------------------------------------------------------------------
+# Bearer token Prometheus scrapes /metrics/ with, see utils/metrics.py; unset
+# turns the endpoint off.
+METRICS_TOKEN = env("DJANGO_METRICS_TOKEN", default="")
+
+# Profiling
+# ------------------------------------------------------------------------------
+# Sampling profiler for requests, see utils/profiler.py. Requests with an
+# X-Profile header from "manage.py profile_token" are always profiled.
+PROFILER_SAMPLE_RATE = env.float("DJANGO_PROFILER_SAMPLE_RATE", default=0)
+# Seconds after which any request is profiled; 0 turns this off.
+PROFILER_LATENCY_THRESHOLD = env.float("DJANGO_PROFILER_LATENCY_THRESHOLD", default=0)
+# Seconds between two samples of a profiled request's stack.
+PROFILER_INTERVAL = env.float("DJANGO_PROFILER_INTERVAL", default=0.005)
+PROFILER_DIR = env("DJANGO_PROFILER_DIR", default="/tmp/profiles")
+PROFILER_MAX_BYTES = env.int("DJANGO_PROFILER_MAX_BYTES", default=100 * 1024 * 1024)
 {% if cookiecutter.use_compressor == 'y' -%}
 # django-compressor
 # ------------------------------------------------------------------------------
@@ -315,10 +426,21 @@ STATICFILES_FINDERS += ["compressor.finders.CompressorFinder"]
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
+        "{{cookiecutter.project_slug}}.users.api.authentication.CachedTokenAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    "DEFAULT_THROTTLE_CLASSES": (
+        "{{cookiecutter.project_slug}}.users.api.throttling.AnonRateThrottle",
+        "{{cookiecutter.project_slug}}.users.api.throttling.UserRateThrottle",
+    ),
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": env("DJANGO_API_ANON_RATE_LIMIT", default="60/m"),
+        "user": env("DJANGO_API_USER_RATE_LIMIT", default="600/m"),
+    },
+    "NUM_PROXIES": RATELIMIT_NUM_PROXIES,
 }
+# Seconds an API token -> user lookup is cached for by CachedTokenAuthentication.
+API_TOKEN_CACHE_TIMEOUT = env.int("DJANGO_API_TOKEN_CACHE_TIMEOUT", default=60)
 {%- endif %}
 # Your stuff...
 # ------------------------------------------------------------------------------
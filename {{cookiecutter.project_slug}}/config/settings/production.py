@@ -33,7 +33,8 @@ CACHES = {
         "BACKEND": "django_redis.cache.RedisCache",
         "LOCATION": env("REDIS_URL"),
         "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            # DefaultClient counting cache hits and misses per request.
+            "CLIENT_CLASS": "{{cookiecutter.project_slug}}.utils.metrics.InstrumentedRedisClient",
             # Mimicing memcache behavior.
             # http://niwinz.github.io/django-redis/latest/#_memcached_exceptions_behavior
             "IGNORE_EXCEPTIONS": True,
@@ -186,7 +187,7 @@ ADMIN_URL = env("DJANGO_ADMIN_URL")
 # ------------------------------------------------------------------------------
 # https://anymail.readthedocs.io/en/stable/installation/#installing-anymail
 INSTALLED_APPS += ["anymail"]  # noqa F405
-EMAIL_BACKEND = "anymail.backends.mailgun.EmailBackend"
+ASYNC_EMAIL_BACKEND = "anymail.backends.mailgun.EmailBackend"
 # https://anymail.readthedocs.io/en/stable/installation/#anymail-settings-reference
 ANYMAIL = {
     "MAILGUN_API_KEY": env("MAILGUN_API_KEY"),
@@ -222,13 +223,11 @@ INSTALLED_APPS = ["collectfast"] + INSTALLED_APPS  # noqa F405
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
-    "filters": {"require_debug_false": {"()": "django.utils.log.RequireDebugFalse"}},
-    "formatters": {
-        "verbose": {
-            "format": "%(levelname)s %(asctime)s %(module)s "
-            "%(process)d %(thread)d %(message)s"
-        }
+    "filters": {
+        "require_debug_false": {"()": "django.utils.log.RequireDebugFalse"},
+        "request_context": {"()": "{{cookiecutter.project_slug}}.utils.log.RequestContextFilter"},
     },
+    "formatters": {"json": {"()": "{{cookiecutter.project_slug}}.utils.log.JSONFormatter"}},
     "handlers": {
         "mail_admins": {
             "level": "ERROR",
@@ -238,19 +237,32 @@ LOGGING = {
         "console": {
             "level": "DEBUG",
             "class": "logging.StreamHandler",
-            "formatter": "verbose",
+            "formatter": "json",
+        },
+        # Hand records to the handlers above from threads of their own, so
+        # neither writing logs nor sending mail holds up requests; see
+        # utils/log.py.
+        "queue": {
+            "class": "{{cookiecutter.project_slug}}.utils.log.QueueHandler",
+            "handlers": ["cfg://handlers.console"],
+            "filters": ["request_context"],
+        },
+        "queue_mail_admins": {
+            "class": "{{cookiecutter.project_slug}}.utils.log.QueueHandler",
+            "handlers": ["cfg://handlers.mail_admins"],
+            "filters": ["request_context"],
         },
     },
-    "root": {"level": "INFO", "handlers": ["console"]},
+    "root": {"level": "INFO", "handlers": ["queue"]},
     "loggers": {
         "django.request": {
-            "handlers": ["mail_admins"],
+            "handlers": ["queue_mail_admins"],
             "level": "ERROR",
             "propagate": True,
         },
         "django.security.DisallowedHost": {
             "level": "ERROR",
-            "handlers": ["console", "mail_admins"],
+            "handlers": ["queue", "queue_mail_admins"],
             "propagate": True,
         },
     },
@@ -259,31 +271,37 @@ LOGGING = {
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": True,
-    "formatters": {
-        "verbose": {
-            "format": "%(levelname)s %(asctime)s %(module)s "
-            "%(process)d %(thread)d %(message)s"
-        }
+    "filters": {
+        # Adds request_id, user_id and elapsed to records, see utils/log.py.
+        "request_context": {"()": "{{cookiecutter.project_slug}}.utils.log.RequestContextFilter"}
     },
+    "formatters": {"json": {"()": "{{cookiecutter.project_slug}}.utils.log.JSONFormatter"}},
     "handlers": {
         "console": {
             "level": "DEBUG",
             "class": "logging.StreamHandler",
-            "formatter": "verbose",
-        }
+            "formatter": "json",
+        },
+        # Hands records to "console" from a thread of its own, so writing logs
+        # does not hold up requests; see utils/log.py.
+        "queue": {
+            "class": "{{cookiecutter.project_slug}}.utils.log.QueueHandler",
+            "handlers": ["cfg://handlers.console"],
+            "filters": ["request_context"],
+        },
     },
-    "root": {"level": "INFO", "handlers": ["console"]},
+    "root": {"level": "INFO", "handlers": ["queue"]},
     "loggers": {
         "django.db.backends": {
             "level": "ERROR",
-            "handlers": ["console"],
+            "handlers": ["queue"],
             "propagate": False,
         },
         # Errors logged by the SDK itself
-        "sentry_sdk": {"level": "ERROR", "handlers": ["console"], "propagate": False},
+        "sentry_sdk": {"level": "ERROR", "handlers": ["queue"], "propagate": False},
         "django.security.DisallowedHost": {
             "level": "ERROR",
-            "handlers": ["console"],
+            "handlers": ["queue"],
             "propagate": False,
         },
     },
@@ -25,6 +25,11 @@ CACHES = {
     }
 }
 
+# USERS
+# ------------------------------------------------------------------------------
+# Tests flush buffered user activity explicitly.
+USER_ACTIVITY_FLUSH_INTERVAL = 0
+
 # PASSWORDS
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#password-hashers
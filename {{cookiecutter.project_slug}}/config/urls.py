@@ -4,6 +4,8 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.views.generic import TemplateView
 from django.views import defaults as default_views
+
+from {{ cookiecutter.project_slug }}.utils.metrics import metrics_view
 {% if cookiecutter.use_drf == 'y' -%}
 from rest_framework.authtoken.views import obtain_auth_token
 {%- endif %}
@@ -18,6 +20,7 @@ urlpatterns = [
     # User management
     path("users/", include("{{ cookiecutter.project_slug }}.users.urls", namespace="users")),
     path("accounts/", include("allauth.urls")),
+    path("metrics/", metrics_view, name="metrics"),
     # Your stuff: custom urls includes go here
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 {% if cookiecutter.use_drf == 'y' -%}
@@ -1,8 +1,16 @@
 import pytest
+from django.core.cache import cache
 from django.test import RequestFactory
 
 from {{ cookiecutter.project_slug }}.users.models import User
 from {{ cookiecutter.project_slug }}.users.tests.factories import UserFactory
+from {{ cookiecutter.project_slug }}.utils.ratelimit import get_limiter
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "ignore_query_budget: do not enforce per-view query budgets"
+    )
 
 
 @pytest.fixture(autouse=True)
@@ -10,6 +18,24 @@ def media_storage(settings, tmpdir):
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # The test database is rolled back between tests; cached rows must go too.
+    yield
+    cache.clear()
+    get_limiter().reset()
+
+
+@pytest.fixture(autouse=True)
+def query_budgets(request, settings):
+    """Fail any request whose view runs more SQL queries than its declared budget."""
+    if request.node.get_closest_marker("ignore_query_budget"):
+        return
+    settings.MIDDLEWARE = settings.MIDDLEWARE + [
+        "{{ cookiecutter.project_slug }}.utils.query_budget.QueryBudgetMiddleware"
+    ]
+
+
 @pytest.fixture
 def user() -> User:
     return UserFactory()
@@ -0,0 +1,191 @@
+"""
+Deferred ``last_login``/``last_seen`` tracking.
+
+Instead of an ``UPDATE users_user`` on every login (Django's
+``update_last_login``) or request, timestamps are recorded in a buffer and
+written by ``flush()`` in batches, one ``UPDATE ... FROM (VALUES ...)``
+statement per field and batch on PostgreSQL.
+
+The buffer is a Redis hash per field when the default cache is django-redis,
+shared by all processes and flushed by the ``flush_user_activity`` Celery beat
+task if Celery is installed. Otherwise each process buffers in memory and
+flushes from a background thread every ``USER_ACTIVITY_FLUSH_INTERVAL``
+seconds (0 disables the thread, e.g. in tests).
+
+These writes send no model signals, so ``write()`` sends ``activity_written``
+with the ids it updated for the caches of users to be dropped.
+"""
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, connections, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+FIELDS = ["last_login", "last_seen"]
+# Skip re-recording a user's field more often than this many seconds.
+RESOLUTION = 60
+BATCH_SIZE = 1000
+
+# {field: {user id: Unix timestamp}}
+Pending = Dict[str, Dict[int, float]]
+
+activity_written = Signal(providing_args=["field", "user_ids"])
+
+
+class MemoryBuffer:
+    def __init__(self):
+        self._pending: Pending = {field: {} for field in FIELDS}
+        self._lock = threading.Lock()
+
+    def add(self, field: str, user_id: int, timestamp: float):
+        with self._lock:
+            pending = self._pending[field]
+            pending[user_id] = max(timestamp, pending.get(user_id, timestamp))
+
+    def drain(self) -> Pending:
+        with self._lock:
+            pending, self._pending = self._pending, {field: {} for field in FIELDS}
+        return pending
+
+
+class RedisBuffer:
+    key_prefix = "users:activity:"
+
+    def __init__(self):
+        from django_redis import get_redis_connection
+
+        self.redis = get_redis_connection("default")
+        self._recent: Dict[Tuple[str, int], float] = {}
+
+    def add(self, field: str, user_id: int, timestamp: float):
+        recent = self._recent.get((field, user_id))
+        if recent is not None and timestamp - recent < RESOLUTION:
+            return
+        if len(self._recent) > 10000:
+            self._recent.clear()
+        self._recent[(field, user_id)] = timestamp
+        self.redis.hset(f"{self.key_prefix}{field}", user_id, timestamp)
+
+    def drain(self) -> Pending:
+        # Read and delete atomically (MULTI/EXEC) so no recording is lost.
+        pipeline = self.redis.pipeline()
+        for field in FIELDS:
+            pipeline.hgetall(f"{self.key_prefix}{field}")
+            pipeline.delete(f"{self.key_prefix}{field}")
+        results = pipeline.execute()[::2]
+        return {
+            field: {int(user_id): float(ts) for user_id, ts in result.items()}
+            for field, result in zip(FIELDS, results)
+        }
+
+
+_buffer: Optional[Union[MemoryBuffer, RedisBuffer]] = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            if settings.CACHES["default"]["BACKEND"].startswith("django_redis."):
+                _buffer = RedisBuffer()
+            else:
+                _buffer = MemoryBuffer()
+            _start_flusher(_buffer)
+        return _buffer
+
+
+def _start_flusher(buffer):
+    interval = settings.USER_ACTIVITY_FLUSH_INTERVAL
+    if isinstance(buffer, RedisBuffer) and apps.is_installed("django_celery_beat"):
+        return
+    if not interval:
+        return
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                flush()
+            except Exception:
+                logger.exception("Could not flush user activity")
+            finally:
+                connections.close_all()
+
+    threading.Thread(target=run, name="user-activity-flusher", daemon=True).start()
+    if isinstance(buffer, MemoryBuffer):
+        atexit.register(flush)
+
+
+def record(user_id: int, field: str = "last_seen", when: Optional[datetime] = None):
+    """Remember that ``user_id``'s ``field`` should become ``when`` (now)."""
+    when = when or timezone.now()
+    get_buffer().add(field, user_id, when.timestamp())
+
+
+def flush() -> int:
+    """Write the buffered timestamps to the users table, returning the row count."""
+    rows = 0
+    for field, pending in get_buffer().drain().items():
+        items = sorted(pending.items())
+        while items:
+            batch, items = items[:BATCH_SIZE], items[BATCH_SIZE:]
+            rows += write(
+                field,
+                {
+                    user_id: datetime.fromtimestamp(ts, tz=timezone.utc)
+                    for user_id, ts in batch
+                },
+            )
+    return rows
+
+
+def write(field: str, timestamps: Dict[int, datetime]) -> int:
+    """Set ``field`` for many users, never moving a timestamp backwards."""
+    if not timestamps:
+        return 0
+    user_ids = _update(field, timestamps)
+    if user_ids:
+        activity_written.send(sender=User, field=field, user_ids=user_ids)
+    return len(user_ids)
+
+
+def _update(field: str, timestamps: Dict[int, datetime]) -> List[int]:
+    if connection.vendor == "postgresql":
+        quote_name = connection.ops.quote_name
+        table = quote_name(User._meta.db_table)
+        pk = quote_name(User._meta.get_field("id").column)
+        column = quote_name(User._meta.get_field(field).column)
+        values = ", ".join(["(%s, %s::timestamptz)"] * len(timestamps))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET {column} = v.ts "
+                f"FROM (VALUES {values}) AS v(id, ts) "
+                f"WHERE {table}.{pk} = v.id "
+                f"AND ({table}.{column} IS NULL OR {table}.{column} < v.ts) "
+                f"RETURNING {table}.{pk}",
+                [param for item in timestamps.items() for param in item],
+            )
+            return [user_id for (user_id,) in cursor.fetchall()]
+
+    with transaction.atomic():
+        users = []
+        for user in User.objects.filter(pk__in=timestamps).select_for_update():
+            current = getattr(user, field)
+            if current is None or current < timestamps[user.pk]:
+                setattr(user, field, timestamps[user.pk])
+                users.append(user)
+        User.objects.bulk_update(users, [field])
+    return [user.pk for user in users]
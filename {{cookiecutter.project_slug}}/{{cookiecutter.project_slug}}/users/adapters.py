@@ -1,16 +1,52 @@
+import hashlib
 from typing import Any
 
 from allauth.account.adapter import DefaultAccountAdapter
+from allauth.exceptions import ImmediateHttpResponse
 from allauth.socialaccount.adapter import DefaultSocialAccountAdapter
+from django import forms
 from django.conf import settings
-from django.http import HttpRequest
+from django.http import HttpRequest, HttpResponse
+
+from {{ cookiecutter.project_slug }}.utils.ratelimit import client_ip, get_limiter, parse_rate
+
+
+def rate_limited(key: str, rate: str) -> bool:
+    return not get_limiter().hit(key, *parse_rate(rate)).allowed
+
+
+def check_signup_rate(request: HttpRequest):
+    if rate_limited(
+        f"signup:ip:{client_ip(request)}", settings.SIGNUP_RATE_LIMIT_PER_IP
+    ):
+        raise ImmediateHttpResponse(
+            HttpResponse("Too many sign ups, try again later.", status=429)
+        )
 
 
 class AccountAdapter(DefaultAccountAdapter):
     def is_open_for_signup(self, request: HttpRequest):
+        if request.method == "POST":
+            check_signup_rate(request)
         return getattr(settings, "ACCOUNT_ALLOW_REGISTRATION", True)
 
+    def pre_authenticate(self, request: HttpRequest, **credentials):
+        # Refuse before the password is hashed, so bursts cost no Argon2 time.
+        login = credentials.get("email", credentials.get("username", ""))
+        login_key = hashlib.sha256(login.lower().encode()).hexdigest()
+        if rate_limited(
+            f"login:ip:{client_ip(request)}", settings.LOGIN_RATE_LIMIT_PER_IP
+        ) or rate_limited(
+            f"login:account:{login_key}", settings.LOGIN_RATE_LIMIT_PER_ACCOUNT
+        ):
+            raise forms.ValidationError(self.error_messages["too_many_login_attempts"])
+        super().pre_authenticate(request, **credentials)
+
 
 class SocialAccountAdapter(DefaultSocialAccountAdapter):
     def is_open_for_signup(self, request: HttpRequest, sociallogin: Any):
+        # Only asked when a social login would create a new user; like sign
+        # ups, only submitted forms count, not displaying the signup form.
+        if request.method == "POST":
+            check_signup_rate(request)
         return getattr(settings, "ACCOUNT_ALLOW_REGISTRATION", True)
@@ -3,6 +3,8 @@ from django.contrib.auth import admin as auth_admin
 from django.contrib.auth import get_user_model
 
 from {{ cookiecutter.project_slug }}.users.forms import UserChangeForm, UserCreationForm
+from {{ cookiecutter.project_slug }}.users.models import UserCounter
+from {{ cookiecutter.project_slug }}.utils.paginator import EstimatedCountPaginator
 
 User = get_user_model()
 
@@ -14,4 +16,25 @@ class UserAdmin(auth_admin.UserAdmin):
     add_form = UserCreationForm
     fieldsets = (("User", {"fields": ("name",)}),) + auth_admin.UserAdmin.fieldsets
     list_display = ["username", "name", "is_superuser"]
-    search_fields = ["name"]
+    # Backed by the trigram indexes from migration 0003.
+    search_fields = ["name", "username", "email"]
+    paginator = EstimatedCountPaginator
+    # Skip the extra unfiltered COUNT(*) behind "N results (M total)".
+    show_full_result_count = False
+
+
+@admin.register(UserCounter)
+class UserCounterAdmin(admin.ModelAdmin):
+    """Read-only view of the statistics maintained by ``users.statistics``."""
+
+    list_display = ["key", "value"]
+    ordering = ["-key"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,60 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+
+def token_cache_key(key: str) -> str:
+    # Hash the token so raw credentials never end up in cache keys.
+    return "auth-token:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+def user_token_cache_key(user_id) -> str:
+    return f"auth-token-user:{user_id}"
+
+
+def invalidate_cached_token(user_id, key: str = None):
+    """Drop the cached token snapshot(s) belonging to ``user_id``."""
+    index_key = user_token_cache_key(user_id)
+    keys = [index_key, cache.get(index_key)]
+    if key is not None:
+        keys.append(token_cache_key(key))
+    cache.delete_many([k for k in keys if k])
+
+
+def invalidate_cached_tokens(user_ids):
+    """Drop the cached token snapshots belonging to any of ``user_ids``."""
+    index_keys = [user_token_cache_key(user_id) for user_id in user_ids]
+    cache.delete_many(index_keys + list(cache.get_many(index_keys).values()))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    ``TokenAuthentication`` that caches token -> user snapshots.
+
+    Snapshots live for ``API_TOKEN_CACHE_TIMEOUT`` seconds and are dropped as soon
+    as the token is deleted or its user is saved (see ``users.api.signals``), so
+    deactivating a user locks their token out immediately.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        token = cache.get(cache_key)
+        if token is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related("user").get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+            cache.set_many(
+                {cache_key: token, user_token_cache_key(token.user_id): cache_key},
+                settings.API_TOKEN_CACHE_TIMEOUT,
+            )
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        return (token.user, token)
@@ -0,0 +1,10 @@
+from rest_framework.pagination import CursorPagination
+
+
+class UserCursorPagination(CursorPagination):
+    # Ordering on the primary key keeps every page an index range scan,
+    # so latency does not grow with the table the way OFFSET does.
+    ordering = "id"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
@@ -1,12 +1,59 @@
+from urllib.parse import quote
+
+from django.urls import reverse
+from django.utils.functional import cached_property
+from django.utils.http import RFC3986_SUBDELIMS
 from rest_framework import serializers
 from {{ cookiecutter.project_slug }}.users.models import User
 
+USERNAME_PLACEHOLDER = "__username__"
+
+
+class UsernameHyperlinkField(serializers.Field):
+    """
+    Hyperlink to a username-keyed detail view.
+
+    The URL is reversed once per serializer and then filled in for every object,
+    instead of running ``reverse()`` for each row of a list.
+    """
+
+    def __init__(self, view_name: str, **kwargs):
+        self.view_name = view_name
+        kwargs["read_only"] = True
+        kwargs.setdefault("source", "username")
+        super().__init__(**kwargs)
+
+    @cached_property
+    def url_template(self) -> str:
+        url = reverse(self.view_name, kwargs={"username": USERNAME_PLACEHOLDER})
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request is not None else url
+
+    def to_representation(self, username: str) -> str:
+        # Quote the same way reverse() does.
+        return self.url_template.replace(
+            USERNAME_PLACEHOLDER, quote(username, safe=RFC3986_SUBDELIMS + "/~:@")
+        )
+
 
 class UserSerializer(serializers.ModelSerializer):
+    url = UsernameHyperlinkField(view_name="api:user-detail")
+
+    # Model fields each serializer field reads, used to project querysets with only().
+    field_columns = {
+        "username": ["username"],
+        "email": ["email"],
+        "name": ["name"],
+        "url": ["username"],
+    }
+
     class Meta:
         model = User
         fields = ["username", "email", "name", "url"]
 
-        extra_kwargs = {
-            "url": {"view_name": "api:user-detail", "lookup_field": "username"}
-        }
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested_fields = self.context.get("fields")
+        if requested_fields:
+            for field_name in set(self.fields) - set(requested_fields):
+                self.fields.pop(field_name)
@@ -0,0 +1,25 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from {{ cookiecutter.project_slug }}.users import activity
+
+from .authentication import invalidate_cached_token, invalidate_cached_tokens
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_token(sender, instance, **kwargs):
+    invalidate_cached_token(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Token)
+def invalidate_token(sender, instance, **kwargs):
+    invalidate_cached_token(instance.user_id, instance.key)
+
+
+@receiver(activity.activity_written)
+def invalidate_active_user_tokens(sender, user_ids, **kwargs):
+    invalidate_cached_tokens(user_ids)
@@ -0,0 +1,31 @@
+from rest_framework import throttling
+
+from {{ cookiecutter.project_slug }}.utils.ratelimit import get_limiter
+
+
+class TokenBucketRateThrottle(throttling.SimpleRateThrottle):
+    """
+    Throttle with ``utils.ratelimit``'s token buckets instead of the request
+    history DRF keeps in the cache, which takes a read and a write per request
+    and can be overwritten by concurrent requests.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+        self.result = get_limiter().hit(key, self.num_requests, self.duration)
+        return self.result.allowed
+
+    def wait(self):
+        return self.result.retry_after
+
+
+class AnonRateThrottle(TokenBucketRateThrottle, throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(TokenBucketRateThrottle, throttling.UserRateThrottle):
+    pass
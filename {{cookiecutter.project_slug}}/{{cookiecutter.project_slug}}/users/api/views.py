@@ -1,10 +1,16 @@
 from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.mixins import RetrieveModelMixin, ListModelMixin, UpdateModelMixin
+from rest_framework.permissions import SAFE_METHODS, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from {{ cookiecutter.project_slug }}.users import statistics
+from {{ cookiecutter.project_slug }}.utils.conditional import conditional_on_modified
+
+from .pagination import UserCursorPagination
 from .serializers import UserSerializer
 
 User = get_user_model()
@@ -14,11 +20,79 @@ class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericV
     serializer_class = UserSerializer
     queryset = User.objects.all()
     lookup_field = "username"
+    pagination_class = UserCursorPagination
+    query_budget = {
+        "list": 2,
+        "retrieve": 3,
+        "update": 3,
+        "partial_update": 3,
+        "me": 1,
+        "stats": 2,
+    }
 
     def get_queryset(self, *args, **kwargs):
-        return self.queryset.filter(id=self.request.user.id)
+        queryset = self.queryset.filter(id=self.request.user.id)
+        fields = self.get_requested_fields()
+        if fields:
+            queryset = queryset.only(
+                *{
+                    column
+                    for field in fields
+                    for column in self.serializer_class.field_columns[field]
+                }
+            )
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.get_requested_fields()
+        return context
+
+    def get_requested_fields(self):
+        """Parse the ``?fields=`` sparse fieldset of read requests."""
+        if self.request.method not in SAFE_METHODS:
+            return None
+        fields = [
+            field
+            for field in self.request.query_params.get("fields", "").split(",")
+            if field
+        ]
+        unknown = set(fields) - set(self.serializer_class.field_columns)
+        if unknown:
+            raise ValidationError(
+                {"fields": [f"Unknown field: {field}" for field in sorted(unknown)]}
+            )
+        return fields or None
+
+    def get_object_modified(self, request, *args, **kwargs):
+        """Look up only the modification time of the requested user."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return (
+            self.queryset.filter(
+                id=request.user.id, **{self.lookup_field: kwargs[lookup_url_kwarg]}
+            )
+            .values_list("modified", flat=True)
+            .first()
+        )
+
+    @conditional_on_modified(get_object_modified)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     @action(detail=False, methods=["GET"])
+    @conditional_on_modified(lambda view, request: request.user.modified)
     def me(self, request):
-        serializer = UserSerializer(request.user, context={"request": request})
+        serializer = self.get_serializer(request.user)
         return Response(status=status.HTTP_200_OK, data=serializer.data)
+
+    @action(detail=False, methods=["GET"], permission_classes=[IsAdminUser])
+    def stats(self, request):
+        try:
+            days = int(request.query_params.get("days", 30))
+        except ValueError:
+            raise ValidationError({"days": ["A whole number is required."]})
+        if not 0 <= days <= 366:
+            raise ValidationError({"days": ["Must be between 0 and 366."]})
+        return Response(
+            status=status.HTTP_200_OK, data=statistics.get_statistics(days=days)
+        )
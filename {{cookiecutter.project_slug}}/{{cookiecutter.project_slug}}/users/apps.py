@@ -11,3 +11,10 @@ class UsersConfig(AppConfig):
             import {{ cookiecutter.project_slug }}.users.signals  # noqa F401
         except ImportError:
             pass
+{%- if cookiecutter.use_drf == "y" %}
+        import {{ cookiecutter.project_slug }}.users.api.signals  # noqa F401
+{%- endif %}
+{%- if cookiecutter.use_celery == "y" %}
+        import {{ cookiecutter.project_slug }}.utils.batching  # noqa F401
+        import {{ cookiecutter.project_slug }}.utils.beat  # noqa F401
+{%- endif %}
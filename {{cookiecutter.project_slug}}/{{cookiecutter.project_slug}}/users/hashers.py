@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class ProfiledArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2 whose cost parameters come from ``ARGON2_PROFILES[PASSWORD_HASHER_PROFILE]``.
+
+    Hashes made with any other parameters report ``must_update``, so Django
+    re-hashes them with the current profile on the user's next successful login.
+    """
+
+    @property
+    def profile(self):
+        return settings.ARGON2_PROFILES[settings.PASSWORD_HASHER_PROFILE]
+
+    @property
+    def time_cost(self):
+        return self.profile["time_cost"]
+
+    @property
+    def memory_cost(self):
+        return self.profile["memory_cost"]
+
+    @property
+    def parallelism(self):
+        return self.profile["parallelism"]
@@ -0,0 +1,148 @@
+"""
+Bulk user import used by the ``import_users`` command.
+
+Records are streamed from CSV or JSON Lines and imported in batches: passwords
+are hashed in a process pool (Argon2 is deliberately CPU-bound), then each batch
+is inserted with one ``bulk_create`` for users and one for allauth's
+``EmailAddress`` inside its own transaction. Usernames that already exist are
+skipped, which makes re-running a batch after a crash harmless.
+"""
+import csv
+import json
+import os
+from concurrent.futures import Executor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from allauth.account.models import EmailAddress
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from {{ cookiecutter.project_slug }}.users import statistics
+
+User = get_user_model()
+
+FORMATS = ["csv", "jsonl"]
+# Passwords sent to a hashing process at a time.
+HASH_CHUNK_SIZE = 32
+
+
+def read_records(path: str, input_format: str) -> Iterator[Dict[str, str]]:
+    """Yield one dict per user record, reading ``path`` lazily."""
+    with open(path, newline="") as f:
+        if input_format == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def hash_password(password: Optional[str]) -> str:
+    # Blank passwords become unusable ones rather than hashes of "".
+    return make_password(password or None)
+
+
+class Checkpoint:
+    """Number of input records already imported, persisted after each batch."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> int:
+        try:
+            with open(self.path) as f:
+                return json.load(f)["records"]
+        except FileNotFoundError:
+            return 0
+
+    def save(self, records: int):
+        # Write then rename so a crash never leaves a truncated checkpoint.
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"records": records}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class UserImporter:
+    def __init__(self, executor: Optional[Executor] = None, verified: bool = False):
+        self.executor = executor
+        self.verified = verified
+
+    def hash_passwords(self, passwords: List[Optional[str]]) -> List[str]:
+        if self.executor is None:
+            return [hash_password(password) for password in passwords]
+        return list(
+            self.executor.map(hash_password, passwords, chunksize=HASH_CHUNK_SIZE)
+        )
+
+    def import_batch(self, records: List[Dict[str, str]]) -> Tuple[int, int]:
+        """Import one batch, returning the number of users created and skipped."""
+        for record in records:
+            if not record.get("username"):
+                raise ValueError(f"Record without a username: {record!r}")
+
+        existing = set(
+            User.objects.filter(
+                username__in=[record["username"] for record in records]
+            ).values_list("username", flat=True)
+        )
+        by_username: Dict[str, Dict[str, str]] = {}
+        for record in records:
+            if record["username"] not in existing:
+                by_username.setdefault(record["username"], record)
+        new_records = list(by_username.values())
+
+        # Hash before opening the transaction so no locks are held meanwhile.
+        passwords = self.hash_passwords(
+            [record.get("password") for record in new_records]
+        )
+        users = [
+            User(
+                username=record["username"],
+                email=User.objects.normalize_email(record.get("email") or ""),
+                name=record.get("name") or "",
+                password=password,
+            )
+            for record, password in zip(new_records, passwords)
+        ]
+
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            # bulk_create sends no post_save, so keep the statistics here.
+            statistics.increment(statistics.user_deltas(users))
+            # Not every backend returns primary keys from bulk inserts.
+            user_ids = dict(
+                User.objects.filter(
+                    username__in=[user.username for user in users]
+                ).values_list("username", "id")
+            )
+            EmailAddress.objects.bulk_create(
+                [
+                    EmailAddress(
+                        user_id=user_ids[user.username],
+                        email=user.email,
+                        primary=True,
+                        verified=self.verified,
+                    )
+                    for user in users
+                    if user.email
+                ],
+                ignore_conflicts=True,
+            )
+
+        return len(users), len(records) - len(users)
@@ -0,0 +1,104 @@
+import logging
+import threading
+import time
+
+from celery import Celery
+from celery.contrib.testing import tasks  # noqa: F401 (registers celery.ping)
+from celery.contrib.testing.worker import start_worker
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# (serializer, whether results are stored)
+CONFIGURATIONS = [
+    ("json", True),
+    ("json", False),
+    ("msgpack", True),
+    ("msgpack", False),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark a fan-out of no-op Celery tasks through a worker in this "
+        "process, with JSON or msgpack messages and with results stored or "
+        "ignored, reporting tasks/s and the Redis memory left in use."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=100_000)
+        parser.add_argument(
+            "--broker",
+            default=settings.CELERY_BROKER_URL,
+            help="Defaults to CELERY_BROKER_URL; also used as the result backend.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            import msgpack  # noqa: F401
+        except ImportError:
+            raise CommandError("The benchmark needs msgpack: pip install msgpack")
+
+        # The worker logs every task at INFO.
+        logging.getLogger("celery").setLevel(logging.WARNING)
+        for serializer, store_results in CONFIGURATIONS:
+            self.benchmark(serializer, store_results, options)
+
+    def benchmark(self, serializer, store_results, options):
+        broker = options["broker"]
+        in_memory = broker.startswith("memory:")
+        app = Celery("benchmark")
+        app.conf.update(
+            # Unlike broker_url, not overridden by the CELERY_BROKER_URL variable.
+            broker_read_url=broker,
+            broker_write_url=broker,
+            # The in-memory transport (for tests) polls once a second otherwise.
+            broker_transport_options={"polling_interval": 0.01} if in_memory else {},
+            result_backend="cache+memory://" if in_memory else broker,
+            task_serializer=serializer,
+            result_serializer=serializer,
+            accept_content=[serializer],
+            task_ignore_result=not store_results,
+            result_expires=settings.CELERY_RESULT_EXPIRES,
+            task_default_queue=f"benchmark.{serializer}.{store_results}",
+        )
+        done = threading.Event()
+        executed = 0
+        lock = threading.Lock()
+
+        @app.task(name="benchmark.noop", shared=False)
+        def noop():
+            nonlocal executed
+            with lock:
+                executed += 1
+                if executed == options["tasks"]:
+                    done.set()
+
+        memory_before = self.used_memory(app, broker)
+        task_ids = []
+        with start_worker(app, perform_ping_check=False, loglevel="WARNING"):
+            start = time.perf_counter()
+            with app.producer_or_acquire() as producer:
+                for _ in range(options["tasks"]):
+                    task_ids.append(noop.apply_async(producer=producer).id)
+            if not done.wait(timeout=max(60, options["tasks"] / 100)):
+                raise CommandError(f"Only {executed} tasks ran")
+            elapsed = time.perf_counter() - start
+        memory = self.used_memory(app, broker)
+
+        if store_results:
+            for task_id in task_ids:
+                app.backend.forget(task_id)
+        label = f"{serializer}, results {'stored' if store_results else 'ignored'}"
+        memory_used = (
+            "n/a" if memory is None else f"{(memory - memory_before) / 2 ** 20:.1f} MiB"
+        )
+        self.stdout.write(
+            f"{label}: {options['tasks'] / elapsed:.0f} tasks/s, "
+            f"Redis memory {memory_used}"
+        )
+
+    def used_memory(self, app, broker):
+        if not broker.startswith("redis"):
+            return None
+        with app.connection_for_read() as connection:
+            return connection.default_channel.client.info("memory")["used_memory"]
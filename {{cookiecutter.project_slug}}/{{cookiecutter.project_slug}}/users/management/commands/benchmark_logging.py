@@ -0,0 +1,83 @@
+import logging
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from {{ cookiecutter.project_slug }}.utils.log import (
+    JSONFormatter,
+    QueueHandler,
+    RequestContextFilter,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark JSON logging to a file written directly by a StreamHandler "
+        "against the same handler behind a QueueHandler, reporting the time a "
+        "logging call takes on the calling thread and the records/s written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--records", type=int, default=100_000)
+        parser.add_argument(
+            "--threads", type=int, default=4, help="Concurrent logging threads."
+        )
+        parser.add_argument(
+            "--output",
+            default=os.devnull,
+            help="File the records are written to, by default discarded.",
+        )
+
+    def handle(self, *args, **options):
+        with open(options["output"], "w") as stream:
+            stream_handler = logging.StreamHandler(stream)
+            stream_handler.setFormatter(JSONFormatter())
+            stream_handler.addFilter(RequestContextFilter())
+            self.benchmark("StreamHandler", stream_handler, options)
+
+            queue_handler = QueueHandler([stream_handler])
+            queue_handler.addFilter(RequestContextFilter())
+            try:
+                self.benchmark("QueueHandler", queue_handler, options)
+            finally:
+                queue_handler.stop()
+
+    def benchmark(self, label, handler, options):
+        logger = logging.getLogger(f"benchmark.{label}")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        logger.addHandler(handler)
+        per_thread = options["records"] // options["threads"]
+
+        def log(thread):
+            durations = []
+            for n in range(per_thread):
+                start = time.perf_counter()
+                logger.info("Record %d from thread %d", n, thread)
+                durations.append(time.perf_counter() - start)
+            return durations
+
+        try:
+            with ThreadPoolExecutor(options["threads"]) as executor:
+                start = time.perf_counter()
+                durations = sorted(
+                    duration
+                    for thread in executor.map(log, range(options["threads"]))
+                    for duration in thread
+                )
+            if isinstance(handler, QueueHandler):
+                # Written once the listener has drained the queue.
+                handler.queue.join()
+            elapsed = time.perf_counter() - start
+        finally:
+            logger.removeHandler(handler)
+
+        p99 = durations[int(len(durations) * 0.99) - 1]
+        self.stdout.write(
+            f"{label}: {len(durations) / elapsed:.0f} records/s written, "
+            f"logging call p50 {statistics.median(durations) * 1e6:.1f}us "
+            f"p99 {p99 * 1e6:.1f}us"
+        )
@@ -0,0 +1,71 @@
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+PASSWORD = "correct horse battery staple"
+HASHER = "{{ cookiecutter.project_slug }}.users.hashers.ProfiledArgon2PasswordHasher"
+
+
+def percentile(latencies, percent):
+    latencies = sorted(latencies)
+    return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark password verification, the CPU-bound part of a login, "
+        "for each Argon2 cost profile at fixed worker counts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profiles",
+            nargs="+",
+            help="Profiles from ARGON2_PROFILES to run (default: all).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            nargs="+",
+            default=[1, os.cpu_count()],
+            help="Concurrent logins to simulate; argon2 releases the GIL.",
+        )
+        parser.add_argument("--logins", type=int, default=200, help="Logins per run.")
+
+    def handle(self, *args, **options):
+        profiles = options["profiles"] or list(settings.ARGON2_PROFILES)
+        unknown = set(profiles) - set(settings.ARGON2_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown profiles: {', '.join(sorted(unknown))}")
+
+        for profile in profiles:
+            with override_settings(
+                PASSWORD_HASHERS=[HASHER], PASSWORD_HASHER_PROFILE=profile
+            ):
+                encoded = make_password(PASSWORD)
+                for workers in options["workers"]:
+                    self.benchmark(profile, encoded, workers, options["logins"])
+
+    def benchmark(self, profile, encoded, workers, logins):
+        def login(_):
+            start = time.perf_counter()
+            if not check_password(PASSWORD, encoded):
+                raise CommandError("Password verification failed")
+            return time.perf_counter() - start
+
+        with ThreadPoolExecutor(workers) as executor:
+            start = time.perf_counter()
+            latencies = list(executor.map(login, range(logins)))
+            elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            f"{profile} x{workers}: {logins / elapsed:.0f} logins/s, "
+            f"p50 {statistics.median(latencies) * 1000:.1f}ms, "
+            f"p99 {percentile(latencies, 99) * 1000:.1f}ms"
+        )
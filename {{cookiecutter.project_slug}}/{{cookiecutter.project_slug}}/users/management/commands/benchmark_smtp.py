@@ -0,0 +1,94 @@
+import logging
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+BACKENDS = [
+    "django.core.mail.backends.smtp.EmailBackend",
+    "{{ cookiecutter.project_slug }}.utils.mail.PooledSMTPEmailBackend",
+]
+
+
+class Sink:
+    """aiosmtpd handler accepting and discarding every message."""
+
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return "250 Message accepted for delivery"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark Django's SMTP backend against the pooled one, sending one "
+        "message per send_messages() call to a local aiosmtpd server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=10000)
+        parser.add_argument(
+            "--threads", type=int, default=4, help="Concurrent senders."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            from aiosmtpd.controller import Controller
+        except ImportError:
+            raise CommandError("The benchmark needs aiosmtpd: pip install aiosmtpd")
+
+        # aiosmtpd logs every SMTP command at INFO.
+        logging.getLogger("mail.log").setLevel(logging.WARNING)
+        sink = Sink()
+        port = free_port()
+        controller = Controller(sink, hostname="127.0.0.1", port=port)
+        controller.start()
+        try:
+            with override_settings(
+                EMAIL_HOST="127.0.0.1",
+                EMAIL_PORT=port,
+                EMAIL_HOST_USER="",
+                EMAIL_HOST_PASSWORD="",
+                EMAIL_USE_TLS=False,
+                EMAIL_USE_SSL=False,
+            ):
+                for backend in BACKENDS:
+                    self.benchmark(backend, sink, options)
+        finally:
+            controller.stop()
+
+    def benchmark(self, backend, sink, options):
+        sink.received = 0
+        messages = [
+            EmailMessage(
+                f"Benchmark {n}", "Hello", "from@example.com", ["to@example.com"]
+            )
+            for n in range(options["messages"])
+        ]
+
+        def send(message):
+            get_connection(backend).send_messages([message])
+
+        with ThreadPoolExecutor(options["threads"]) as executor:
+            start = time.perf_counter()
+            list(executor.map(send, messages))
+            elapsed = time.perf_counter() - start
+
+        connection = get_connection(backend)
+        if hasattr(connection, "pool"):
+            connection.pool.close()
+        self.stdout.write(
+            f"{backend.rsplit('.', 1)[-1]}: {len(messages) / elapsed:.0f} messages/s, "
+            f"{sink.received} received"
+        )
@@ -0,0 +1,62 @@
+import time
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from {{ cookiecutter.project_slug }}.users.api.authentication import (
+    CachedTokenAuthentication,
+    invalidate_cached_token,
+)
+from {{ cookiecutter.project_slug }}.users.api.views import UserViewSet
+
+User = get_user_model()
+
+AUTHENTICATION_CLASSES = [TokenAuthentication, CachedTokenAuthentication]
+
+
+class Command(BaseCommand):
+    help = "Benchmark token-authenticated GET /api/users/me/ with and without caching."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests", type=int, default=2000, help="Requests per run."
+        )
+
+    def handle(self, *args, **options):
+        # Everything runs in a transaction that is rolled back, leaving no trace.
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=["testserver"]):
+            user = User.objects.create(username=f"benchmark-{uuid4().hex[:16]}")
+            token = Token.objects.create(user=user)
+            for authentication_class in AUTHENTICATION_CLASSES:
+                self.benchmark(authentication_class, token, options["requests"])
+            transaction.set_rollback(True)
+        invalidate_cached_token(user.pk, token.key)
+
+    def benchmark(self, authentication_class, token, requests):
+        # Unthrottled: the user rate limit would cut the run short.
+        view = UserViewSet.as_view(
+            {"get": "me"},
+            authentication_classes=[authentication_class],
+            throttle_classes=[],
+        )
+        request_factory = RequestFactory(HTTP_AUTHORIZATION=f"Token {token.key}")
+        path = reverse("api:user-me")
+        view(request_factory.get(path)).render()  # warm up
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for _ in range(requests):
+                view(request_factory.get(path)).render()
+            elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            f"{authentication_class.__name__}: {requests / elapsed:.0f} requests/s, "
+            f"{len(queries) / requests:.2f} queries/request"
+        )
@@ -0,0 +1,69 @@
+from typing import Any, Dict, List, TextIO, Union
+
+from django.core.management.base import BaseCommand, CommandError, OutputWrapper
+
+from {{ cookiecutter.project_slug }}.users.export import (
+    DEFAULT_CHUNK_SIZE,
+    EXPORT_FIELDS,
+    FORMATS,
+    ExportStats,
+    export_users,
+    parse_fields,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream all users as CSV or JSON Lines with constant memory use."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument(
+            "--fields",
+            help=f"Comma-separated columns to export (default: {','.join(EXPORT_FIELDS)}).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Rows fetched from the database cursor at a time.",
+        )
+        parser.add_argument(
+            "--output", help="File to write to instead of standard output."
+        )
+        parser.add_argument(
+            "--progress-every",
+            type=int,
+            default=100000,
+            help="Report progress on stderr every N rows (0 disables it).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            fields = parse_fields(options["fields"])
+        except ValueError as e:
+            raise CommandError(e)
+
+        if options["output"]:
+            with open(options["output"], "w", newline="") as output:
+                self.export(output, fields, options)
+        else:
+            self.export(self.stdout, fields, options)
+
+    def export(
+        self,
+        output: Union[TextIO, OutputWrapper],
+        fields: List[str],
+        options: Dict[str, Any],
+    ):
+        progress_every = options["progress_every"]
+        stats = ExportStats()
+        reported = 0
+        for chunk in export_users(
+            fields, options["format"], options["chunk_size"], stats
+        ):
+            output.write(chunk)
+            if progress_every and stats.rows - reported >= progress_every:
+                reported = stats.rows
+                self.stderr.write(f"Exported {stats}")
+
+        self.stderr.write(f"Exported {stats}")
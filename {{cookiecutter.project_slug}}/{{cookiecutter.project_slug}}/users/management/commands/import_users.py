@@ -0,0 +1,93 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+
+from {{ cookiecutter.project_slug }}.users.importer import (
+    FORMATS,
+    Checkpoint,
+    UserImporter,
+    batched,
+    read_records,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import users from CSV or JSON Lines (username, email, name, password), "
+        "hashing passwords in parallel and inserting in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV (with a header row) or JSONL file.")
+        parser.add_argument(
+            "--format", choices=FORMATS, help="Input format (default: from extension)."
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Password hashing processes; 0 hashes in this process.",
+        )
+        parser.add_argument(
+            "--verified",
+            action="store_true",
+            help="Mark imported email addresses as verified.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Progress file used to resume (default: <path>.checkpoint).",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the records a previous, interrupted run already imported.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        input_format = options["format"] or os.path.splitext(path)[1].lstrip(".")
+        if input_format not in FORMATS:
+            raise CommandError(f"Cannot tell the format of {path}, pass --format.")
+
+        checkpoint = Checkpoint(options["checkpoint"] or f"{path}.checkpoint")
+        done = checkpoint.load() if options["resume"] else 0
+        if done:
+            self.stderr.write(f"Resuming after {done} records")
+        records = islice(read_records(path, input_format), done, None)
+
+        executor = (
+            ProcessPoolExecutor(options["workers"], initializer=django.setup)
+            if options["workers"]
+            else None
+        )
+        importer = UserImporter(executor, verified=options["verified"])
+        created = skipped = 0
+        started = time.monotonic()
+        try:
+            for batch in batched(records, options["batch_size"]):
+                try:
+                    batch_created, batch_skipped = importer.import_batch(batch)
+                except ValueError as e:
+                    raise CommandError(f"{e} (after {done} records)")
+                created += batch_created
+                skipped += batch_skipped
+                done += len(batch)
+                checkpoint.save(done)
+                rate = (created + skipped) / (time.monotonic() - started)
+                self.stderr.write(
+                    f"{done} records: {created} created, {skipped} skipped "
+                    f"({rate:.0f} records/s)"
+                )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        checkpoint.clear()
+        self.stdout.write(
+            self.style.SUCCESS(f"Imported {created} users, skipped {skipped}.")
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from {{ cookiecutter.project_slug }}.utils.profiler import TOKEN_MAX_AGE, make_token
+
+
+class Command(BaseCommand):
+    help = (
+        "Print a value for the X-Profile header, which has the requests sending "
+        f"it profiled for the next {TOKEN_MAX_AGE // 60} minutes."
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(make_token())
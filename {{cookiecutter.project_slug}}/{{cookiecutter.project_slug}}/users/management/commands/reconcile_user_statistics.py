@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from {{ cookiecutter.project_slug }}.users import statistics
+
+
+class Command(BaseCommand):
+    help = "Recompute the maintained user statistics from the users table."
+
+    def handle(self, *args, **options):
+        values = statistics.reconcile()
+        total, active = values[statistics.TOTAL], values[statistics.ACTIVE]
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled: {total} users, {active} active.")
+        )
@@ -0,0 +1,86 @@
+"""
+``request.user`` served from the cache instead of a ``users_user`` query on
+every authenticated request.
+
+The loaded user is cached per user id for ``USER_CACHE_TIMEOUT`` seconds and
+dropped when the user is saved or deleted (which covers password changes), on
+login and logout, and when ``users.activity`` writes its timestamps. A cached user is only used
+if the session's auth hash still matches it, exactly like
+``django.contrib.auth.get_user`` checks a freshly loaded one.
+"""
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from {{ cookiecutter.project_slug }}.users import activity
+
+
+def request_user_cache_key(user_id) -> str:
+    return f"users:request-user:{user_id}"
+
+
+def invalidate_cached_request_user(user_id):
+    cache.delete(request_user_cache_key(user_id))
+
+
+def invalidate_cached_request_users(user_ids):
+    cache.delete_many([request_user_cache_key(user_id) for user_id in user_ids])
+
+
+def _load_user(request):
+    try:
+        # The raw session value formats to the same key as ``user.pk``.
+        user_id = request.session[auth.SESSION_KEY]
+        backend_path = request.session[auth.BACKEND_SESSION_KEY]
+    except KeyError:
+        return auth.get_user(request)
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return auth.get_user(request)
+
+    key = request_user_cache_key(user_id)
+    user = cache.get(key)
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    if (
+        user is not None
+        and session_hash
+        and constant_time_compare(session_hash, user.get_session_auth_hash())
+    ):
+        return user
+
+    # Missing or stale: let Django load the user and flush a session whose
+    # hash no longer matches.
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+    return user
+
+
+def get_cached_user(request):
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = _load_user(request)
+    return request._cached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """Drop-in replacement for ``AuthenticationMiddleware`` using the cache."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
+
+
+class LastSeenMiddleware:
+    """Record when authenticated users were last seen, see ``users.activity``."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            activity.record(user.pk, "last_seen")
+        return response
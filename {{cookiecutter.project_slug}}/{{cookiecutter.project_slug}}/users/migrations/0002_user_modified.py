@@ -0,0 +1,20 @@
+from django.db import migrations
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("users", "0001_initial")]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="modified",
+            field=model_utils.fields.AutoLastModifiedField(
+                default=django.utils.timezone.now,
+                editable=False,
+                verbose_name="modified",
+            ),
+        )
+    ]
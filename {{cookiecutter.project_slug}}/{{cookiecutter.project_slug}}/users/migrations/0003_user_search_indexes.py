@@ -0,0 +1,39 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# The admin searches with ``icontains``, which PostgreSQL runs as
+# ``UPPER("column"::text) LIKE UPPER('%q%')``: index that exact expression.
+SEARCH_COLUMNS = ["name", "username", "email"]
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS users_user_{column}_trgm "
+            f'ON users_user USING gin (UPPER("{column}"::text) gin_trgm_ops)'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f"DROP INDEX CONCURRENTLY IF EXISTS users_user_{column}_trgm"
+        )
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, but it does not
+    # lock the table against writes while a large index builds.
+    atomic = False
+
+    dependencies = [("users", "0002_user_modified")]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("users", "0003_user_search_indexes")]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserCounter",
+            fields=[
+                (
+                    "key",
+                    models.CharField(
+                        max_length=64,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="key",
+                    ),
+                ),
+                (
+                    "value",
+                    models.BigIntegerField(default=0, verbose_name="value"),
+                ),
+            ],
+            options={
+                "verbose_name": "user counter",
+                "verbose_name_plural": "user counters",
+            },
+        )
+    ]
@@ -1,7 +1,8 @@
 from django.contrib.auth.models import AbstractUser
-from django.db.models import CharField
+from django.db.models import BigIntegerField, CharField, DateTimeField, Model
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
+from model_utils.fields import AutoLastModifiedField
 
 
 class User(AbstractUser):
@@ -9,6 +10,25 @@ class User(AbstractUser):
     # First Name and Last Name do not cover name patterns
     # around the globe.
     name = CharField(_("Name of User"), blank=True, max_length=255)
+    modified = AutoLastModifiedField(_("modified"))
+    # Written in batches by users.activity, like last_login.
+    last_seen = DateTimeField(_("last seen"), blank=True, null=True)
 
     def get_absolute_url(self):
         return reverse("users:detail", kwargs={"username": self.username})
+
+
+class UserCounter(Model):
+    """
+    A maintained user statistic, see ``{{ cookiecutter.project_slug }}.users.statistics``.
+    """
+
+    key = CharField(_("key"), primary_key=True, max_length=64)
+    value = BigIntegerField(_("value"), default=0)
+
+    class Meta:
+        verbose_name = _("user counter")
+        verbose_name_plural = _("user counters")
+
+    def __str__(self):
+        return f"{self.key}: {self.value}"
@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from {{ cookiecutter.project_slug }}.users import activity, statistics
+from {{ cookiecutter.project_slug }}.users.middleware import (
+    invalidate_cached_request_user,
+    invalidate_cached_request_users,
+)
+
+User = get_user_model()
+
+
+@receiver(post_init, sender=User)
+def remember_is_active(sender, instance, **kwargs):
+    # Read __dict__ so deferred loading (e.g. ``.only("id")``) never queries.
+    instance._saved_is_active = instance.__dict__.get("is_active")
+
+
+@receiver(post_save, sender=User)
+def count_saved_user(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        statistics.increment(statistics.user_deltas([instance]))
+    elif (update_fields is None or "is_active" in update_fields) and (
+        instance._saved_is_active not in (None, instance.is_active)
+    ):
+        statistics.increment({statistics.ACTIVE: 1 if instance.is_active else -1})
+    if update_fields is None or "is_active" in update_fields:
+        instance._saved_is_active = instance.is_active
+
+
+@receiver(post_delete, sender=User)
+def count_deleted_user(sender, instance, **kwargs):
+    statistics.increment(statistics.user_deltas([instance], sign=-1))
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_request_user(sender, instance, **kwargs):
+    invalidate_cached_request_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def invalidate_logged_out_user(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_cached_request_user(user.pk)
+
+
+@receiver(activity.activity_written)
+def invalidate_active_users(sender, user_ids, **kwargs):
+    invalidate_cached_request_users(user_ids)
+
+
+# Replace Django's per-login UPDATE with a deferred, batched one.
+user_logged_in.disconnect(update_last_login, dispatch_uid="update_last_login")
+
+
+@receiver(user_logged_in)
+def record_last_login(sender, request, user, **kwargs):
+    user.last_login = timezone.now()
+    activity.record(user.pk, "last_login", user.last_login)
+    invalidate_cached_request_user(user.pk)
@@ -0,0 +1,158 @@
+"""
+User statistics kept in ``UserCounter`` rows, so reading them is an indexed
+lookup instead of a ``COUNT(*)`` over the users table.
+
+The signal handlers in ``users.signals`` adjust the counters in the same
+transaction as the change that caused them. ``reconcile`` recomputes them from
+the users table, correcting drift from writes that bypass signals
+(``QuerySet.update``, raw SQL); it runs periodically and on first read.
+Readers get results cached for up to ``CACHE_TIMEOUT`` seconds.
+
+Keys are ``total``, ``active`` and ``signups:<YYYY-MM-DD>``, the latter counting
+the users that joined that day (in the current time zone) and still exist.
+"""
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from {{ cookiecutter.project_slug }}.users.models import UserCounter
+from {{ cookiecutter.project_slug }}.utils.cache import cached
+
+User = get_user_model()
+
+TOTAL = "total"
+ACTIVE = "active"
+SIGNUPS_PREFIX = "signups:"
+
+CACHE_TIMEOUT = 60
+USER_COUNT_CACHE_KEY = "users:statistics:count"
+
+
+def signups_key(day: date) -> str:
+    return f"{SIGNUPS_PREFIX}{day.isoformat()}"
+
+
+def _joined_day(user) -> date:
+    if timezone.is_aware(user.date_joined):
+        return timezone.localdate(user.date_joined)
+    return user.date_joined.date()
+
+
+def user_deltas(users: Iterable, sign: int = 1) -> Dict[str, int]:
+    """Counter changes for ``users`` being created (``sign=1``) or deleted (-1)."""
+    users = list(users)
+    signups = Counter(_joined_day(user) for user in users)
+    # Keys are in lock order (see increment).
+    deltas = {
+        TOTAL: sign * len(users),
+        ACTIVE: sign * sum(1 for user in users if user.is_active),
+    }
+    deltas.update({signups_key(day): sign * n for day, n in sorted(signups.items())})
+    return deltas
+
+
+def increment(deltas: Dict[str, int]):
+    """
+    Apply ``deltas`` to the counters, in the order given.
+
+    Callers pass ``total`` and ``active`` before any ``signups:`` keys, so
+    concurrent writers and ``reconcile`` lock rows in the same order and cannot
+    deadlock. Missing ``total``/``active`` rows are left for ``reconcile``
+    to create, since an increment cannot know their starting value.
+    """
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        if UserCounter.objects.filter(key=key).update(value=F("value") + delta):
+            continue
+        if not key.startswith(SIGNUPS_PREFIX):
+            continue
+        try:
+            with transaction.atomic():
+                UserCounter.objects.create(key=key, value=delta)
+        except IntegrityError:
+            # Created concurrently; it exists now.
+            UserCounter.objects.filter(key=key).update(value=F("value") + delta)
+
+
+def reconcile() -> Dict[str, int]:
+    """Recompute every counter from the users table and return the values."""
+    with transaction.atomic():
+        # Lock the counters before counting: concurrent writers then apply
+        # their increments after this transaction rather than being overwritten.
+        existing = {
+            counter.key: counter
+            for counter in UserCounter.objects.select_for_update().order_by()
+        }
+        values = {
+            TOTAL: User.objects.count(),
+            ACTIVE: User.objects.filter(is_active=True).count(),
+        }
+        signups = (
+            User.objects.annotate(day=TruncDate("date_joined"))
+            .values_list("day")
+            .annotate(n=Count("id"))
+            .order_by()
+        )
+        values.update({signups_key(day): n for day, n in signups})
+
+        kept = [counter for key, counter in existing.items() if key in values]
+        for counter in kept:
+            counter.value = values[counter.key]
+        UserCounter.objects.bulk_update(kept, ["value"])
+        UserCounter.objects.filter(
+            key__in=[key for key in existing if key not in values]
+        ).delete()
+        UserCounter.objects.bulk_create(
+            [
+                UserCounter(key=key, value=value)
+                for key, value in values.items()
+                if key not in existing
+            ],
+            ignore_conflicts=True,
+        )
+    cache.delete(USER_COUNT_CACHE_KEY)
+    return values
+
+
+def _read(keys) -> Dict[str, int]:
+    def fetch():
+        return {
+            counter.key: counter.value
+            for counter in UserCounter.objects.filter(key__in=keys)
+        }
+
+    values = fetch()
+    if TOTAL not in values:
+        reconcile()
+        values = fetch()
+    return values
+
+
+@cached(USER_COUNT_CACHE_KEY, timeout=CACHE_TIMEOUT)
+def get_user_count() -> int:
+    return _read([TOTAL])[TOTAL]
+
+
+def _statistics_cache_key(days: int = 30, today: Optional[date] = None) -> str:
+    return f"users:statistics:{days}:{today or timezone.localdate()}"
+
+
+@cached(_statistics_cache_key, timeout=CACHE_TIMEOUT)
+def get_statistics(days: int = 30, today: Optional[date] = None) -> Dict:
+    """Total and active users, and signups on each of the last ``days`` days."""
+    today = today or timezone.localdate()
+    since = [today - timedelta(days=n) for n in reversed(range(days))]
+    values = _read([TOTAL, ACTIVE] + [signups_key(day) for day in since])
+    return {
+        "total": values[TOTAL],
+        "active": values.get(ACTIVE, 0),
+        "signups": {day.isoformat(): values.get(signups_key(day), 0) for day in since},
+    }
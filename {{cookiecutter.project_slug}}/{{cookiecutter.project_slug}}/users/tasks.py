@@ -1,11 +1,48 @@
-from django.contrib.auth import get_user_model
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
+from django.core.mail import get_connection
 
 from config import celery_app
+from {{ cookiecutter.project_slug }}.users import activity, statistics
+from {{ cookiecutter.project_slug }}.utils.idempotency import IdempotentTask
+from {{ cookiecutter.project_slug }}.utils.mail import deserialize_message
 
-User = get_user_model()
+
+@celery_app.task(base=IdempotentTask, ignore_result=False, result_window=60)
+def get_users_count():
+    """Return the number of users, read from the maintained statistics."""
+    return statistics.get_user_count()
 
 
 @celery_app.task()
-def get_users_count():
-    """A pointless Celery task to demonstrate usage."""
-    return User.objects.count()
+def reconcile_user_statistics():
+    """Correct the maintained user statistics, scheduled by CELERY_BEAT_SCHEDULE."""
+    statistics.reconcile()
+
+
+@celery_app.task()
+def flush_user_activity():
+    """Write buffered last_login/last_seen timestamps, see users.activity."""
+    return activity.flush()
+
+
+@celery_app.task(bind=True, max_retries=5)
+def send_email_messages(self, messages):
+    """
+    Deliver mail queued by AsyncEmailBackend over one connection.
+
+    Messages are handed to the backend one at a time, so a connection error
+    (SMTPException is an OSError) retries only those not sent yet.
+    """
+    done = 0
+    try:
+        with get_connection(settings.ASYNC_EMAIL_BACKEND) as connection:
+            for message in messages:
+                connection.send_messages([deserialize_message(message)])
+                done += 1
+    except OSError as exc:
+        countdown = get_exponential_backoff_interval(
+            factor=1, retries=self.request.retries, maximum=600, full_jitter=True
+        )
+        raise self.retry(args=(messages[done:],), exc=exc, countdown=countdown)
+    return done
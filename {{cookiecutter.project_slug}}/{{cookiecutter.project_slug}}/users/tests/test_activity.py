@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from {{ cookiecutter.project_slug }}.users import activity
+from {{ cookiecutter.project_slug }}.users.models import User
+from {{ cookiecutter.project_slug }}.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def empty_buffer():
+    activity.get_buffer().drain()
+
+
+class TestActivity:
+    def test_flush(self, user: User):
+        other = UserFactory()
+        now = timezone.now()
+        activity.record(user.pk, "last_seen", now - timedelta(minutes=1))
+        activity.record(user.pk, "last_seen", now)
+        activity.record(other.pk, "last_login", now)
+
+        assert activity.flush() == 2
+
+        user.refresh_from_db()
+        other.refresh_from_db()
+        assert user.last_seen == now
+        assert other.last_login == now
+        assert activity.flush() == 0
+
+    def test_never_moves_backwards(self, user: User):
+        now = timezone.now()
+        User.objects.filter(pk=user.pk).update(last_seen=now)
+
+        activity.write("last_seen", {user.pk: now - timedelta(hours=1)})
+
+        user.refresh_from_db()
+        assert user.last_seen == now
+
+    def test_login_is_deferred(self, client: Client, user: User):
+        user.set_password("secret")
+        user.save()
+
+        client.login(username=user.username, password="secret")
+
+        user.refresh_from_db()
+        assert user.last_login is None
+        activity.flush()
+        user.refresh_from_db()
+        assert user.last_login is not None
+
+    def test_last_seen_middleware(self, client: Client, user: User):
+        client.force_login(user)
+        client.get(reverse("home"))
+
+        activity.flush()
+
+        user.refresh_from_db()
+        assert user.last_seen is not None
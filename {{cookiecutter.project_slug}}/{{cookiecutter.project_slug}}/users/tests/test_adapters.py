@@ -0,0 +1,57 @@
+from unittest.mock import patch
+
+import pytest
+from allauth.exceptions import ImmediateHttpResponse
+from django.test import Client, RequestFactory
+from django.urls import reverse
+
+from {{ cookiecutter.project_slug }}.users.adapters import SocialAccountAdapter
+from {{ cookiecutter.project_slug }}.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+class TestAccountAdapter:
+    def test_login_rate_limited_per_account(self, client: Client, settings, user: User):
+        settings.LOGIN_RATE_LIMIT_PER_ACCOUNT = "2/m"
+        credentials = {"login": user.username, "password": "wrong"}
+        for _ in range(2):
+            client.post(reverse("account_login"), credentials)
+
+        with patch("allauth.account.adapter.authenticate") as authenticate:
+            response = client.post(reverse("account_login"), credentials)
+
+        assert b"Too many failed login attempts" in response.content
+        authenticate.assert_not_called()
+
+    def test_login_rate_limited_per_ip(self, client: Client, settings):
+        settings.LOGIN_RATE_LIMIT_PER_IP = "2/m"
+        for username in ["a", "b"]:
+            client.post(reverse("account_login"), {"login": username, "password": "x"})
+
+        response = client.post(
+            reverse("account_login"), {"login": "c", "password": "x"}
+        )
+
+        assert b"Too many failed login attempts" in response.content
+
+    def test_signup_rate_limited(self, client: Client, settings):
+        settings.SIGNUP_RATE_LIMIT_PER_IP = "1/h"
+        client.post(reverse("account_signup"), {})
+
+        assert client.post(reverse("account_signup"), {}).status_code == 429
+        assert client.get(reverse("account_signup")).status_code == 200
+
+
+class TestSocialAccountAdapter:
+    def test_signup_rate_limited_on_post(
+        self, request_factory: RequestFactory, settings
+    ):
+        settings.SIGNUP_RATE_LIMIT_PER_IP = "1/h"
+        adapter = SocialAccountAdapter()
+        for _ in range(3):
+            assert adapter.is_open_for_signup(request_factory.get("/"), None)
+
+        assert adapter.is_open_for_signup(request_factory.post("/"), None)
+        with pytest.raises(ImmediateHttpResponse):
+            adapter.is_open_for_signup(request_factory.post("/"), None)
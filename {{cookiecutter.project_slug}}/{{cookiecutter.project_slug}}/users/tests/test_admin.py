@@ -0,0 +1,58 @@
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from {{ cookiecutter.project_slug }}.users.models import User
+from {{ cookiecutter.project_slug }}.users.tests.factories import UserFactory
+from {{ cookiecutter.project_slug }}.utils.paginator import (
+    ESTIMATE_THRESHOLD,
+    EstimatedCountPaginator,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+class TestUserAdmin:
+    def test_search(self, admin_client: Client):
+        UserFactory(username="ada", name="Ada Lovelace", email="ada@example.com")
+        UserFactory(username="grace", name="Grace Hopper", email="gh@example.com")
+
+        response = admin_client.get(
+            reverse("admin:users_user_changelist"), {"q": "LOVELACE"}
+        )
+
+        assert response.status_code == 200
+        results = response.context["cl"].result_list
+        assert [user.username for user in results] == ["ada"]
+
+    def test_search_by_email(self, admin_client: Client):
+        UserFactory(username="grace", email="rear.admiral@example.com")
+
+        response = admin_client.get(
+            reverse("admin:users_user_changelist"), {"q": "admiral"}
+        )
+
+        assert response.context["cl"].result_count == 1
+
+
+class TestEstimatedCountPaginator:
+    def test_exact_count_without_estimate(self, user: User):
+        paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 10)
+
+        assert paginator.estimated_count() is None
+        assert paginator.count == 1
+
+    def test_uses_large_estimate(self, monkeypatch, user: User):
+        monkeypatch.setattr(
+            EstimatedCountPaginator, "estimated_count", lambda self: ESTIMATE_THRESHOLD
+        )
+
+        paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 10)
+
+        assert paginator.count == ESTIMATE_THRESHOLD
+        assert paginator.num_pages == ESTIMATE_THRESHOLD // 10
+
+    def test_ignores_small_estimate(self, monkeypatch, user: User):
+        monkeypatch.setattr(EstimatedCountPaginator, "estimated_count", lambda self: 5)
+
+        assert EstimatedCountPaginator(User.objects.order_by("pk"), 10).count == 1
@@ -0,0 +1,164 @@
+import json
+from io import StringIO
+
+import pytest
+from allauth.account.models import EmailAddress
+from django.core.management import CommandError, call_command
+
+from {{ cookiecutter.project_slug }}.users.importer import Checkpoint
+from {{ cookiecutter.project_slug }}.users.models import User
+from {{ cookiecutter.project_slug }}.users.tests.factories import UserFactory
+from {{ cookiecutter.project_slug }}.utils.profiler import is_valid_token
+
+pytestmark = pytest.mark.django_db
+
+
+class TestBenchmarkPasswordHashing:
+    def test_reports_profiles(self):
+        out = StringIO()
+
+        call_command(
+            "benchmark_password_hashing",
+            profiles=["low"],
+            workers=[1, 2],
+            logins=4,
+            stdout=out,
+        )
+
+        lines = out.getvalue().splitlines()
+        assert [line.split(":")[0] for line in lines] == ["low x1", "low x2"]
+        assert all("p99" in line for line in lines)
+
+    def test_unknown_profile(self):
+        with pytest.raises(CommandError):
+            call_command("benchmark_password_hashing", profiles=["turbo"])
+
+
+class TestReconcileUserStatistics:
+    def test_reconcile(self, user: User):
+        out = StringIO()
+
+        call_command("reconcile_user_statistics", stdout=out)
+
+        assert "1 users, 1 active" in out.getvalue()
+
+
+class TestBenchmarkSMTP:
+    def test_reports_backends(self):
+        out = StringIO()
+
+        call_command("benchmark_smtp", messages=5, threads=2, stdout=out)
+
+        lines = out.getvalue().splitlines()
+        assert [line.split(":")[0] for line in lines] == [
+            "EmailBackend",
+            "PooledSMTPEmailBackend",
+        ]
+        assert all("5 received" in line for line in lines)
+
+
+class TestBenchmarkLogging:
+    def test_reports_handlers(self):
+        out = StringIO()
+
+        call_command("benchmark_logging", records=20, threads=2, stdout=out)
+
+        lines = out.getvalue().splitlines()
+        assert [line.split(":")[0] for line in lines] == [
+            "StreamHandler",
+            "QueueHandler",
+        ]
+
+
+class TestProfileToken:
+    def test_prints_valid_token(self):
+        out = StringIO()
+
+        call_command("profile_token", stdout=out)
+
+        assert is_valid_token(out.getvalue().strip())
+
+
+class TestExportUsers:
+    def test_csv(self, user: User):
+        out, err = StringIO(), StringIO()
+
+        call_command(
+            "export_users", fields="id,email", chunk_size=1, stdout=out, stderr=err
+        )
+
+        assert out.getvalue().splitlines() == ["id,email", f"{user.pk},{user.email}"]
+        assert "Exported 1 rows" in err.getvalue()
+
+    def test_jsonl(self):
+        users = UserFactory.create_batch(3)
+        out = StringIO()
+
+        call_command(
+            "export_users",
+            format="jsonl",
+            fields="username",
+            stdout=out,
+            stderr=StringIO(),
+        )
+
+        assert [json.loads(line) for line in out.getvalue().splitlines()] == [
+            {"username": user.username} for user in users
+        ]
+
+    def test_unknown_field(self):
+        with pytest.raises(CommandError):
+            call_command("export_users", fields="password")
+
+
+class TestImportUsers:
+    @pytest.fixture
+    def csv_path(self, tmp_path) -> str:
+        path = tmp_path / "users.csv"
+        path.write_text(
+            "username,email,name,password\n"
+            "alice,alice@example.com,Alice,secret-1\n"
+            "bob,bob@example.com,Bob,\n"
+            "carol,carol@example.com,Carol,secret-3\n"
+        )
+        return str(path)
+
+    def test_csv(self, csv_path: str):
+        call_command(
+            "import_users", csv_path, workers=2, batch_size=2, stderr=StringIO()
+        )
+
+        alice = User.objects.get(username="alice")
+        assert alice.name == "Alice"
+        assert alice.check_password("secret-1")
+        assert not User.objects.get(username="bob").has_usable_password()
+        assert EmailAddress.objects.filter(
+            user=alice, email="alice@example.com", primary=True, verified=False
+        ).exists()
+
+    def test_jsonl(self, tmp_path):
+        path = tmp_path / "users.jsonl"
+        path.write_text(json.dumps({"username": "dave", "password": "secret"}) + "\n")
+
+        call_command("import_users", str(path), workers=0, stderr=StringIO())
+
+        assert User.objects.get(username="dave").check_password("secret")
+
+    def test_skips_existing(self, csv_path: str):
+        UserFactory(username="alice", name="Original")
+        out = StringIO()
+
+        call_command("import_users", csv_path, workers=0, stdout=out, stderr=StringIO())
+
+        assert User.objects.get(username="alice").name == "Original"
+        assert "Imported 2 users, skipped 1." in out.getvalue()
+
+    def test_resume(self, csv_path: str):
+        Checkpoint(f"{csv_path}.checkpoint").save(2)
+
+        call_command(
+            "import_users", csv_path, workers=0, resume=True, stderr=StringIO()
+        )
+
+        assert list(User.objects.values_list("username", flat=True)) == ["carol"]
+        assert Checkpoint(f"{csv_path}.checkpoint").load() == 0
@@ -0,0 +1,80 @@
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from {{ cookiecutter.project_slug }}.users import activity
+from {{ cookiecutter.project_slug }}.users.api.authentication import CachedTokenAuthentication
+from {{ cookiecutter.project_slug }}.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def token(user: User) -> Token:
+    cache.clear()
+    return Token.objects.create(user=user)
+
+
+def _authenticate(request_factory: RequestFactory, token: Token):
+    request = request_factory.get("/", HTTP_AUTHORIZATION=f"Token {token.key}")
+    return CachedTokenAuthentication().authenticate(request)
+
+
+class TestCachedTokenAuthentication:
+    def test_caches_token(
+        self, request_factory: RequestFactory, token: Token, django_assert_num_queries
+    ):
+        with django_assert_num_queries(1):
+            assert _authenticate(request_factory, token) == (token.user, token)
+        with django_assert_num_queries(0):
+            assert _authenticate(request_factory, token) == (token.user, token)
+
+    def test_token_deleted(self, request_factory: RequestFactory, token: Token):
+        _authenticate(request_factory, token)
+
+        token.delete()
+
+        with pytest.raises(AuthenticationFailed):
+            _authenticate(request_factory, token)
+
+    def test_user_deactivated(self, request_factory: RequestFactory, token: Token):
+        _authenticate(request_factory, token)
+
+        token.user.is_active = False
+        token.user.save()
+
+        with pytest.raises(AuthenticationFailed):
+            _authenticate(request_factory, token)
+
+    def test_user_changed(self, request_factory: RequestFactory, token: Token):
+        _authenticate(request_factory, token)
+
+        token.user.name = "New Name"
+        token.user.save()
+
+        user, _ = _authenticate(request_factory, token)
+        assert user.name == "New Name"
+
+    def test_activity_written(self, request_factory: RequestFactory, token: Token):
+        _authenticate(request_factory, token)
+        now = timezone.now()
+
+        activity.write("last_seen", {token.user_id: now})
+
+        user, _ = _authenticate(request_factory, token)
+        assert user.last_seen == now
+
+
+def test_benchmark_token_auth():
+    out = StringIO()
+
+    call_command("benchmark_token_auth", requests=5, stdout=out)
+
+    assert "TokenAuthentication: " in out.getvalue()
+    assert "CachedTokenAuthentication: " in out.getvalue()
@@ -0,0 +1,134 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from {{ cookiecutter.project_slug }}.users import statistics
+from {{ cookiecutter.project_slug }}.users.api.throttling import UserRateThrottle
+from {{ cookiecutter.project_slug }}.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_login(user)
+    return client
+
+
+class TestUserViewSet:
+    def test_list(self, api_client: APIClient, user: User):
+        response = api_client.get(reverse("api:user-list"))
+
+        assert response.status_code == 200
+        assert response.data["next"] is None
+        assert [item["username"] for item in response.data["results"]] == [
+            user.username
+        ]
+
+    def test_list_sparse_fieldset(self, api_client: APIClient, user: User):
+        response = api_client.get(reverse("api:user-list"), {"fields": "name,url"})
+
+        assert response.status_code == 200
+        url = f"http://testserver/api/users/{user.username}/"
+        assert response.data["results"] == [{"name": user.name, "url": url}]
+
+    def test_list_unknown_field(self, api_client: APIClient):
+        response = api_client.get(reverse("api:user-list"), {"fields": "password"})
+
+        assert response.status_code == 400
+
+    def test_retrieve(self, api_client: APIClient, user: User):
+        response = api_client.get(
+            reverse("api:user-detail", kwargs={"username": user.username})
+        )
+
+        assert response.status_code == 200
+        assert response.data["username"] == user.username
+
+    def test_retrieve_not_modified(self, api_client: APIClient, user: User):
+        url = reverse("api:user-detail", kwargs={"username": user.username})
+        response = api_client.get(url)
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+
+        assert response.status_code == 200
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        assert (
+            api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 304
+        )
+
+    def test_partial_update(self, api_client: APIClient, user: User):
+        response = api_client.patch(
+            reverse("api:user-detail", kwargs={"username": user.username}),
+            {"name": "New Name"},
+        )
+
+        assert response.status_code == 200
+        user.refresh_from_db()
+        assert user.name == "New Name"
+
+    def test_me(self, api_client: APIClient, user: User):
+        response = api_client.get(reverse("api:user-me"))
+
+        assert response.status_code == 200
+        assert response.data == {
+            "username": user.username,
+            "email": user.email,
+            "name": user.name,
+            "url": f"http://testserver/api/users/{user.username}/",
+        }
+
+    def test_me_etag_changes_on_save(self, api_client: APIClient, user: User):
+        url = reverse("api:user-me")
+        etag = api_client.get(url)["ETag"]
+
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        user.name = "New Name"
+        user.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_me_etag_changes_on_profile_update(self, api_client: APIClient, user: User):
+        url = reverse("api:user-me")
+        etag = api_client.get(url)["ETag"]
+
+        api_client.post(reverse("users:update"), {"name": "New Name"})
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response.json()["name"] == "New Name"
+
+    def test_stats(self, api_client: APIClient, user: User):
+        user.is_staff = True
+        user.save()
+        statistics.reconcile()
+
+        response = api_client.get(reverse("api:user-stats"), {"days": 7})
+
+        assert response.status_code == 200
+        assert response.data["total"] == 1
+        assert len(response.data["signups"]) == 7
+
+    def test_stats_requires_staff(self, api_client: APIClient):
+        assert api_client.get(reverse("api:user-stats")).status_code == 403
+
+    def test_stats_invalid_days(self, api_client: APIClient, user: User):
+        user.is_staff = True
+        user.save()
+
+        response = api_client.get(reverse("api:user-stats"), {"days": "many"})
+
+        assert response.status_code == 400
+
+
+class TestThrottling:
+    def test_user_rate(self, api_client: APIClient, monkeypatch):
+        monkeypatch.setattr(UserRateThrottle, "THROTTLE_RATES", {"user": "2/m"})
+
+        responses = [api_client.get(reverse("api:user-me")) for _ in range(3)]
+
+        assert [response.status_code for response in responses] == [200, 200, 429]
+        assert int(responses[2]["Retry-After"]) > 0
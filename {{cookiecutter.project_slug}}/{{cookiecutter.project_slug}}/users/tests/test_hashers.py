@@ -0,0 +1,40 @@
+import pytest
+from django.contrib.auth.hashers import check_password, identify_hasher, make_password
+
+from {{ cookiecutter.project_slug }}.users.models import User
+
+HASHER = "{{ cookiecutter.project_slug }}.users.hashers.ProfiledArgon2PasswordHasher"
+
+
+@pytest.fixture(autouse=True)
+def profiled_hasher(settings):
+    settings.PASSWORD_HASHERS = [HASHER]
+    settings.PASSWORD_HASHER_PROFILE = "low"
+
+
+class TestProfiledArgon2PasswordHasher:
+    def test_encodes_with_profile(self, settings):
+        encoded = make_password("secret")
+
+        assert encoded.startswith("argon2$argon2i$v=19$m=256,t=1,p=1$")
+        assert check_password("secret", encoded)
+
+    def test_must_update_when_profile_changes(self, settings):
+        encoded = make_password("secret")
+        hasher = identify_hasher(encoded)
+        assert not hasher.must_update(encoded)
+
+        settings.PASSWORD_HASHER_PROFILE = "default"
+
+        assert hasher.must_update(encoded)
+
+    @pytest.mark.django_db
+    def test_upgraded_on_login(self, settings, user: User):
+        user.set_password("secret")
+        user.save()
+        settings.PASSWORD_HASHER_PROFILE = "default"
+
+        assert user.check_password("secret")
+
+        user.refresh_from_db()
+        assert "$m=512,t=2,p=2$" in user.password
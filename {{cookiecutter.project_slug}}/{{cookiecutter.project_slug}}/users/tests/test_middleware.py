@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from {{ cookiecutter.project_slug }}.users import activity
+from {{ cookiecutter.project_slug }}.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def logged_in_client(client: Client, user: User) -> Client:
+    client.force_login(user)
+    return client
+
+
+def whoami(client: Client):
+    response = client.get(reverse("home"))
+    return response.wsgi_request.user
+
+
+class TestCachedAuthenticationMiddleware:
+    def test_cached_after_first_request(self, logged_in_client: Client, user: User):
+        assert whoami(logged_in_client) == user
+
+        with CaptureQueriesContext(connection) as queries:
+            assert whoami(logged_in_client) == user
+
+        assert not [query for query in queries if "users_user" in query["sql"]]
+
+    def test_invalidated_on_save(self, logged_in_client: Client, user: User):
+        whoami(logged_in_client)
+
+        user.name = "New Name"
+        user.save()
+
+        assert whoami(logged_in_client).name == "New Name"
+
+    def test_invalidated_on_activity_write(self, logged_in_client: Client, user: User):
+        whoami(logged_in_client)
+        now = timezone.now()
+
+        activity.write("last_seen", {user.pk: now})
+
+        assert whoami(logged_in_client).last_seen == now
+
+    def test_password_change_logs_out(self, logged_in_client: Client, user: User):
+        whoami(logged_in_client)
+
+        user.set_password("new password")
+        user.save()
+
+        assert not whoami(logged_in_client).is_authenticated
+
+    def test_logout(self, logged_in_client: Client):
+        whoami(logged_in_client)
+
+        logged_in_client.logout()
+
+        assert not whoami(logged_in_client).is_authenticated
+
+    def test_anonymous(self, client: Client):
+        assert not whoami(client).is_authenticated
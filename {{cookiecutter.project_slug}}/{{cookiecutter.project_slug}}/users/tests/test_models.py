@@ -7,3 +7,11 @@ pytestmark = pytest.mark.django_db
 
 def test_user_get_absolute_url(user: User):
     assert user.get_absolute_url() == f"/users/{user.username}/"
+
+
+def test_user_modified_updates_on_save(user: User):
+    modified = user.modified
+
+    user.save()
+
+    assert user.modified > modified
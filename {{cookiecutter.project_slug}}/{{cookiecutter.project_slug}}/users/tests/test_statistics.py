@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from {{ cookiecutter.project_slug }}.users import statistics
+from {{ cookiecutter.project_slug }}.users.models import User, UserCounter
+from {{ cookiecutter.project_slug }}.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def counters():
+    return dict(UserCounter.objects.values_list("key", "value"))
+
+
+class TestUserStatistics:
+    def test_reconciles_on_first_read(self):
+        UserFactory.create_batch(2)
+        UserCounter.objects.all().delete()
+
+        assert statistics.get_user_count() == 2
+        assert counters()[statistics.TOTAL] == 2
+
+    def test_signup(self, user: User):
+        statistics.reconcile()
+        UserFactory(is_active=False)
+
+        today = statistics.signups_key(timezone.localdate())
+        assert counters() == {statistics.TOTAL: 2, statistics.ACTIVE: 1, today: 2}
+
+    def test_deactivate_and_delete(self, user: User):
+        statistics.reconcile()
+
+        user.is_active = False
+        user.save()
+        assert counters()[statistics.ACTIVE] == 0
+
+        user.name = "renamed"
+        user.save(update_fields=["name"])
+        assert counters()[statistics.ACTIVE] == 0
+
+        user.delete()
+        today = statistics.signups_key(timezone.localdate())
+        assert counters() == {statistics.TOTAL: 0, statistics.ACTIVE: 0, today: 0}
+
+    def test_reconcile_corrects_drift(self):
+        old = UserFactory(date_joined=timezone.now() - timedelta(days=3))
+        UserFactory()
+        User.objects.filter(pk=old.pk).update(is_active=False)
+        gone = timezone.localdate() - timedelta(days=10)
+        UserCounter.objects.create(key=statistics.signups_key(gone), value=5)
+
+        statistics.reconcile()
+
+        assert counters() == {
+            statistics.TOTAL: 2,
+            statistics.ACTIVE: 1,
+            statistics.signups_key(timezone.localdate(old.date_joined)): 1,
+            statistics.signups_key(timezone.localdate()): 1,
+        }
+
+    def test_get_statistics(self, user: User):
+        today = timezone.localdate()
+
+        assert statistics.get_statistics(days=2) == {
+            "total": 1,
+            "active": 1,
+            "signups": {
+                (today - timedelta(days=1)).isoformat(): 0,
+                today.isoformat(): 1,
+            },
+        }
@@ -1,9 +1,35 @@
+import gc
+import smtplib
+import time
+from io import StringIO
+from typing import Any, Dict
+from unittest.mock import Mock
+
 import pytest
+from celery.app.task import Context
 from celery.result import EagerResult
+from django.core import mail
+from django.core.mail import EmailMessage, send_mail
+from django.core.mail.backends import locmem
+from django.core.management import call_command
+from prometheus_client import REGISTRY
 
-
-from {{ cookiecutter.project_slug }}.users.tasks import get_users_count
+from config import celery_app
+from config.celery_app import (
+    memory_usage,
+    preload,
+    record_process_start,
+    record_queue_wait,
+    record_runtime,
+    stamp_sent_at,
+)
+from {{ cookiecutter.project_slug }}.users.tasks import (
+    flush_user_activity,
+    get_users_count,
+    send_email_messages,
+)
 from {{ cookiecutter.project_slug }}.users.tests.factories import UserFactory
+from {{ cookiecutter.project_slug }}.utils.mail import serialize_message
 
 
 @pytest.mark.django_db
@@ -14,3 +40,131 @@ def test_user_count(settings):
     task_result = get_users_count.delay()
     assert isinstance(task_result, EagerResult)
     assert task_result.result == 3
+
+
+def test_async_email_backend_queues_task(settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.EMAIL_BACKEND = "{{ cookiecutter.project_slug }}.utils.mail.AsyncEmailBackend"
+    settings.ASYNC_EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+    send_mail("Subject", "Body", "from@example.com", ["to@example.com"])
+
+    assert [message.to for message in mail.outbox] == [["to@example.com"]]
+
+
+class FlakyEmailBackend(locmem.EmailBackend):
+    """Fails the first time it is given a message with subject "Fail once"."""
+
+    failed = False
+
+    def send_messages(self, messages):
+        if messages[0].subject == "Fail once" and not FlakyEmailBackend.failed:
+            FlakyEmailBackend.failed = True
+            raise smtplib.SMTPServerDisconnected("Connection lost")
+        return super().send_messages(messages)
+
+
+def test_send_email_messages_retries_only_unsent(settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.ASYNC_EMAIL_BACKEND = f"{__name__}.FlakyEmailBackend"
+    messages = [
+        serialize_message(EmailMessage(subject, "Body", to=["to@example.com"]))
+        for subject in ["First", "Fail once", "Last"]
+    ]
+
+    send_email_messages.delay(messages)
+
+    assert FlakyEmailBackend.failed
+    assert [message.subject for message in mail.outbox] == [
+        "First",
+        "Fail once",
+        "Last",
+    ]
+
+
+def test_tasks_are_routed(settings):
+    """Every task goes to a queue consumed by one of the worker profiles."""
+    package = get_users_count.name.split(".", 1)[0]
+    names = [
+        name
+        for name in celery_app.tasks
+        if name.startswith(f"{package}.") and ".tests." not in name
+    ]
+
+    assert names
+    for name in names:
+        assert settings.CELERY_TASK_ROUTES[name]["queue"] in {"io", "cpu", "email"}
+
+
+def test_results_ignored_unless_opted_in():
+    assert not get_users_count.ignore_result
+    assert flush_user_activity.ignore_result
+
+
+class TestMetrics:
+    def test_sent_at_is_stamped(self):
+        headers: Dict[str, Any] = {}
+
+        stamp_sent_at(headers=headers)
+
+        assert time.time() - headers["sent_at"] < 1
+
+    def test_queue_wait_and_runtime(self):
+        task = Mock(request=Context(sent_at=time.time() - 5, retries=0))
+        task.name = "test.metrics"
+        labels = {"task": task.name}
+
+        record_queue_wait(task_id="1", task=task)
+        record_runtime(task_id="1", task=task)
+
+        runs = REGISTRY.get_sample_value("celery_task_runtime_seconds_count", labels)
+        waited = REGISTRY.get_sample_value("celery_task_queue_wait_seconds_sum", labels)
+        assert runs == 1
+        assert waited >= 5
+
+
+class TestPreload:
+    def test_freezes_what_is_loaded(self):
+        try:
+            preload()
+            assert gc.get_freeze_count()  # type: ignore
+        finally:
+            gc.unfreeze()  # type: ignore
+
+    def test_off(self, settings):
+        settings.CELERY_WORKER_PRELOAD = False
+
+        preload()
+
+        assert not gc.get_freeze_count()  # type: ignore
+
+    def test_reports_first_task(self, caplog):
+        task = Mock(request=Context(retries=0))
+        record_process_start()
+
+        for task_id in ["1", "2"]:
+            record_queue_wait(task_id=task_id, task=task)
+            record_runtime(task_id=task_id, task=task)
+
+        reports = [r for r in caplog.messages if "ran its first task" in r]
+        assert len(reports) == 1
+
+    def test_memory_usage(self):
+        memory = memory_usage()
+
+        assert memory is None or 0 < memory[1] <= memory[0]
+
+
+def test_benchmark_celery():
+    out = StringIO()
+
+    call_command("benchmark_celery", tasks=20, broker="memory://", stdout=out)
+
+    lines = out.getvalue().splitlines()
+    assert [line.split(":")[0] for line in lines] == [
+        "json, results stored",
+        "json, results ignored",
+        "msgpack, results stored",
+        "msgpack, results ignored",
+    ]
+    assert all("Redis memory n/a" in line for line in lines)
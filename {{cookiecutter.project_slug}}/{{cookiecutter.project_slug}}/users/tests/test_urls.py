@@ -22,3 +22,8 @@ def test_update():
 def test_redirect():
     assert reverse("users:redirect") == "/users/~redirect/"
     assert resolve("/users/~redirect/").view_name == "users:redirect"
+
+
+def test_export():
+    assert reverse("users:export") == "/users/~export/"
+    assert resolve("/users/~export/").view_name == "users:export"
@@ -1,5 +1,9 @@
+import json
+
 import pytest
-from django.test import RequestFactory
+from django.test import Client, RequestFactory
+from django.urls import reverse
+from django.utils import timezone
 
 from {{ cookiecutter.project_slug }}.users.models import User
 from {{ cookiecutter.project_slug }}.users.views import UserRedirectView, UserUpdateView
@@ -7,6 +11,17 @@ from {{ cookiecutter.project_slug }}.users.views import UserRedirectView, UserUp
 pytestmark = pytest.mark.django_db
 
 
+class TestUserDetailView:
+    def test_authenticated(self, client: Client, user: User):
+        client.force_login(user)
+
+        response = client.get(
+            reverse("users:detail", kwargs={"username": user.username})
+        )
+
+        assert response.status_code == 200
+
+
 class TestUserUpdateView:
     """
     TODO:
@@ -34,6 +49,28 @@ class TestUserUpdateView:
 
         assert view.get_object() == user
 
+    def test_form_valid(self, client: Client, user: User):
+        client.force_login(user)
+
+        assert client.get(reverse("users:update")).status_code == 200
+        response = client.post(reverse("users:update"), {"name": "New Name"})
+
+        assert response.status_code == 302
+        user.refresh_from_db()
+        assert user.name == "New Name"
+
+    def test_form_valid_keeps_activity(self, client: Client, user: User):
+        client.force_login(user)
+        client.get(reverse("users:update"))
+        # Written behind the cached request.user's back, like users.activity.
+        now = timezone.now()
+        User.objects.filter(pk=user.pk).update(last_seen=now)
+
+        client.post(reverse("users:update"), {"name": "New Name"})
+
+        user.refresh_from_db()
+        assert user.last_seen == now
+
 
 class TestUserRedirectView:
     def test_get_redirect_url(self, user: User, request_factory: RequestFactory):
@@ -44,3 +81,53 @@ class TestUserRedirectView:
         view.request = request
 
         assert view.get_redirect_url() == f"/users/{user.username}/"
+
+    def test_authenticated(self, client: Client, user: User):
+        client.force_login(user)
+
+        response = client.get(reverse("users:redirect"))
+
+        assert response.status_code == 302
+
+
+class TestUserExportView:
+    def test_csv(self, client: Client, user: User):
+        user.is_staff = True
+        user.save()
+        client.force_login(user)
+
+        response = client.get(reverse("users:export"), {"fields": "id,username"})
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/csv"
+        assert b"".join(response.streaming_content).decode().splitlines() == [
+            "id,username",
+            f"{user.pk},{user.username}",
+        ]
+
+    def test_jsonl(self, client: Client, user: User):
+        user.is_staff = True
+        user.save()
+        client.force_login(user)
+
+        response = client.get(
+            reverse("users:export"), {"format": "jsonl", "fields": "username"}
+        )
+
+        assert response.status_code == 200
+        content = b"".join(response.streaming_content).decode()
+        assert json.loads(content) == {"username": user.username}
+
+    def test_unknown_field(self, client: Client, user: User):
+        user.is_staff = True
+        user.save()
+        client.force_login(user)
+
+        response = client.get(reverse("users:export"), {"fields": "password"})
+
+        assert response.status_code == 400
+
+    def test_staff_only(self, client: Client, user: User):
+        client.force_login(user)
+
+        assert client.get(reverse("users:export")).status_code == 403
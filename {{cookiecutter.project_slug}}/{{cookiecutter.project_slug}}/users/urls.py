@@ -1,6 +1,7 @@
 from django.urls import path
 
 from {{ cookiecutter.project_slug }}.users.views import (
+    user_export_view,
     user_redirect_view,
     user_update_view,
     user_detail_view,
@@ -10,5 +11,6 @@ app_name = "users"
 urlpatterns = [
     path("~redirect/", view=user_redirect_view, name="redirect"),
     path("~update/", view=user_update_view, name="update"),
+    path("~export/", view=user_export_view, name="export"),
     path("<str:username>/", view=user_detail_view, name="detail"),
 ]
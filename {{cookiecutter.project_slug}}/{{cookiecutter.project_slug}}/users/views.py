@@ -1,10 +1,28 @@
+import logging
+
 from django.contrib.auth import get_user_model
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.db import transaction
+from django.http import (
+    HttpResponseBadRequest,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
 from django.urls import reverse
-from django.views.generic import DetailView, RedirectView, UpdateView
+from django.utils.decorators import method_decorator
+from django.views.generic import DetailView, RedirectView, UpdateView, View
 from django.contrib import messages
 from django.utils.translation import ugettext_lazy as _
 
+from {{ cookiecutter.project_slug }}.users.export import (
+    FORMATS,
+    ExportStats,
+    export_users,
+    parse_fields,
+)
+
+logger = logging.getLogger(__name__)
+
 User = get_user_model()
 
 
@@ -13,6 +31,7 @@ class UserDetailView(LoginRequiredMixin, DetailView):
     model = User
     slug_field = "username"
     slug_url_kwarg = "username"
+    query_budget = 2
 
 
 user_detail_view = UserDetailView.as_view()
@@ -22,18 +41,24 @@ class UserUpdateView(LoginRequiredMixin, UpdateView):
 
     model = User
     fields = ["name"]
+    query_budget = {"get": 1, "post": 2}
 
     def get_success_url(self):
         return reverse("users:detail", kwargs={"username": self.request.user.username})
 
     def get_object(self):
-        return User.objects.get(username=self.request.user.username)
+        return self.request.user
 
     def form_valid(self, form):
+        # request.user may come from the cache: only write the form's fields
+        # (and ``modified``, which the API's ETags derive from), never its
+        # possibly stale last_login/last_seen.
+        self.object = form.save(commit=False)
+        self.object.save(update_fields=[*form.fields, "modified"])
         messages.add_message(
             self.request, messages.INFO, _("Infos successfully updated")
         )
-        return super().form_valid(form)
+        return HttpResponseRedirect(self.get_success_url())
 
 
 user_update_view = UserUpdateView.as_view()
@@ -42,9 +67,43 @@ user_update_view = UserUpdateView.as_view()
 class UserRedirectView(LoginRequiredMixin, RedirectView):
 
     permanent = False
+    query_budget = 1
 
     def get_redirect_url(self):
         return reverse("users:detail", kwargs={"username": self.request.user.username})
 
 
 user_redirect_view = UserRedirectView.as_view()
+
+
+# The export holds its own transaction for as long as it streams, which has to
+# outlive the view, so it must not run inside ATOMIC_REQUESTS.
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class UserExportView(LoginRequiredMixin, UserPassesTestMixin, View):
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request):
+        export_format = request.GET.get("format", "csv")
+        if export_format not in FORMATS:
+            return HttpResponseBadRequest(f"Unknown format: {export_format}")
+        try:
+            fields = parse_fields(request.GET.get("fields"))
+        except ValueError as e:
+            return HttpResponseBadRequest(str(e))
+
+        _, content_type = FORMATS[export_format]
+        response = StreamingHttpResponse(
+            self.stream(fields, export_format), content_type=content_type
+        )
+        filename = f"users.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def stream(self, fields, export_format):
+        stats = ExportStats()
+        yield from export_users(fields, export_format, stats=stats)
+        logger.info("Exported %s for %s", stats, self.request.user.username)
+
+
+user_export_view = UserExportView.as_view()
@@ -0,0 +1,311 @@
+"""
+Batched Celery work: enqueue items one at a time, process them in groups::
+
+    @batched("users:deactivate", size=500, window=5)
+    def deactivate_users(user_ids):
+        User.objects.filter(pk__in=user_ids).update(is_active=False)
+
+    for user_id in user_ids:
+        deactivate_users.add(user_id)
+
+Items (anything JSON-serializable) are appended to a Redis list per batch when
+the default cache is django-redis. One ``flush_batch`` task is sent when a
+batch fills up (every ``size`` items) and one ``window`` seconds after an item
+is added while none is scheduled, instead of a task per item. The task calls
+the handler with up to ``size`` items at a time until the list is empty.
+
+Items being handled are moved to a processing list until the handler returns.
+If it raises, they go back to the front of the batch and the task is retried;
+once it gives up, another flush is scheduled a window later. If the worker
+dies instead, the next flush takes them back after ``lease`` seconds.
+
+Without Redis items are kept in process memory and flushed from this process:
+by the caller of ``add`` when a batch fills up, from a timer thread otherwise.
+Batches must be defined in a module the worker imports, such as a ``tasks.py``.
+
+``add`` raises ``BatchFull`` once ``max_pending`` items are waiting, pushing
+back on producers rather than letting the backlog grow without bounds.
+"""
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
+
+from config import celery_app
+
+logger = logging.getLogger(__name__)
+
+# (Unix timestamp the item was added at, item)
+Item = Tuple[float, Any]
+
+# Seconds a scheduled window flush may wait for a worker before another is sent.
+SCHEDULE_GRACE = 60
+
+# Move up to ARGV[1] items from the batch to a processing list, registered
+# with the Unix time its lease ends at (ARGV[2]).
+CLAIM_SCRIPT = """
+local items = redis.call("LRANGE", KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #items > 0 then
+    redis.call("LTRIM", KEYS[1], #items, -1)
+    for i = 1, #items do
+        redis.call("RPUSH", KEYS[2], items[i])
+    end
+    redis.call("ZADD", KEYS[3], ARGV[2], KEYS[2])
+end
+return items
+"""
+
+# Put a processing list's items back at the front of the batch, in order.
+REQUEUE_SCRIPT = """
+local items = redis.call("LRANGE", KEYS[2], 0, -1)
+for i = #items, 1, -1 do
+    redis.call("LPUSH", KEYS[1], items[i])
+end
+redis.call("DEL", KEYS[2])
+redis.call("ZREM", KEYS[3], KEYS[2])
+return #items
+"""
+
+_batches: Dict[str, "Batch"] = {}
+
+
+class BatchFull(Exception):
+    pass
+
+
+class MemoryQueue:
+    def __init__(self):
+        self._items: Deque[Item] = deque()
+        self._processing: Dict[str, List[Item]] = {}
+        self._scheduled = False
+        self._lock = threading.Lock()
+
+    def push(self, items: List[Item]) -> int:
+        with self._lock:
+            self._items.extend(items)
+            return len(self._items)
+
+    def claim(self, count: int, claim: str, lease: float) -> List[Item]:
+        with self._lock:
+            items = [self._items.popleft() for _ in range(min(count, len(self._items)))]
+            if items:
+                self._processing[claim] = items
+            return items
+
+    def ack(self, claim: str):
+        with self._lock:
+            self._processing.pop(claim, None)
+
+    def requeue(self, claim: str):
+        with self._lock:
+            self._items.extendleft(reversed(self._processing.pop(claim, [])))
+
+    def recover(self):
+        """Nothing to do: items in process memory die with their process."""
+
+    def schedule(self, ttl: float) -> bool:
+        """Mark a window flush as scheduled, unless one already is."""
+        with self._lock:
+            scheduled, self._scheduled = self._scheduled, True
+            return not scheduled
+
+    def unschedule(self):
+        with self._lock:
+            self._scheduled = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class RedisQueue:
+    key_prefix = "batch:"
+
+    def __init__(self, name: str):
+        from django_redis import get_redis_connection
+
+        self.redis = get_redis_connection("default")
+        self.key = f"{self.key_prefix}{name}"
+        # Sorted set of processing lists, by the time their lease ends.
+        self.processing_key = f"{self.key}:processing"
+        self.scheduled_key = f"{self.key}:scheduled"
+        self.claim_script = self.redis.register_script(CLAIM_SCRIPT)
+        self.requeue_script = self.redis.register_script(REQUEUE_SCRIPT)
+
+    def push(self, items: List[Item]) -> int:
+        return self.redis.rpush(self.key, *[json.dumps(item) for item in items])
+
+    def claim(self, count: int, claim: str, lease: float) -> List[Item]:
+        # Moved atomically so two flushes never share items and none is lost.
+        values = self.claim_script(
+            keys=[self.key, f"{self.processing_key}:{claim}", self.processing_key],
+            args=[count, time.time() + lease],
+        )
+        return [(added, item) for added, item in map(json.loads, values)]
+
+    def ack(self, claim: str):
+        pipeline = self.redis.pipeline()
+        pipeline.delete(f"{self.processing_key}:{claim}")
+        pipeline.zrem(self.processing_key, f"{self.processing_key}:{claim}")
+        pipeline.execute()
+
+    def requeue(self, claim: str):
+        self._requeue(f"{self.processing_key}:{claim}")
+
+    def _requeue(self, processing_list):
+        self.requeue_script(keys=[self.key, processing_list, self.processing_key])
+
+    def recover(self):
+        """Requeue the items of flushes whose lease ran out (a worker died)."""
+        for processing_list in self.redis.zrangebyscore(
+            self.processing_key, "-inf", time.time()
+        ):
+            logger.warning("Requeueing the items of %s", processing_list.decode())
+            self._requeue(processing_list)
+
+    def schedule(self, ttl: float) -> bool:
+        """Mark a window flush as scheduled, unless one already is."""
+        return bool(self.redis.set(self.scheduled_key, 1, nx=True, px=int(ttl * 1000)))
+
+    def unschedule(self):
+        self.redis.delete(self.scheduled_key)
+
+    def __len__(self) -> int:
+        return self.redis.llen(self.key)
+
+
+def make_queue(name: str) -> Union[MemoryQueue, RedisQueue]:
+    if settings.CACHES["default"]["BACKEND"].startswith("django_redis."):
+        return RedisQueue(name)
+    return MemoryQueue()
+
+
+class Batch:
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[List[Any]], Any],
+        size: int = 100,
+        window: float = 1.0,
+        max_pending: int = 10_000,
+        lease: float = 300,
+    ):
+        self.name = name
+        self.handler = handler
+        self.size = size
+        self.window = window
+        self.max_pending = max_pending
+        # Seconds the handler may take before its items are handed out again.
+        self.lease = lease
+        self.metrics = {"batches": 0, "items": 0, "failures": 0, "seconds": 0.0}
+        self._queue: Optional[Union[MemoryQueue, RedisQueue]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def queue(self) -> Union[MemoryQueue, RedisQueue]:
+        with self._lock:
+            if self._queue is None:
+                self._queue = make_queue(self.name)
+            return self._queue
+
+    def add(self, item: Any):
+        self.add_many([item])
+
+    def add_many(self, items: List[Any]):
+        if not items:
+            return
+        if len(self.queue) + len(items) > self.max_pending:
+            raise BatchFull(f"{self.name} has {self.max_pending} items pending")
+        now = time.time()
+        pending = self.queue.push([(now, item) for item in items])
+        self.schedule_window()
+        if pending // self.size > (pending - len(items)) // self.size:
+            self._schedule_flush(0)
+
+    def schedule_window(self):
+        """Flush in ``window`` seconds, unless a window flush is already due."""
+        if self.queue.schedule(self.window + SCHEDULE_GRACE):
+            self._schedule_flush(self.window)
+
+    def _schedule_flush(self, countdown: float):
+        if isinstance(self.queue, RedisQueue):
+            flush_batch.apply_async((self.name,), countdown=countdown or None)
+        elif countdown:
+            timer = threading.Timer(countdown, self._flush_quietly)
+            timer.daemon = True
+            timer.start()
+        else:
+            self.flush()
+
+    def _flush_quietly(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Could not flush batch %s", self.name)
+            self.schedule_window()
+
+    def flush(self) -> int:
+        """Run the handler on every pending item, ``size`` at a time."""
+        # Items added from now on need a flush of their own.
+        self.queue.unschedule()
+        self.queue.recover()
+        flushed = 0
+        while True:
+            claim = uuid.uuid4().hex
+            items = self.queue.claim(self.size, claim, self.lease)
+            if not items:
+                return flushed
+            start = time.monotonic()
+            try:
+                self.handler([item for added, item in items])
+            except Exception:
+                self.queue.requeue(claim)
+                with self._lock:
+                    self.metrics["failures"] += 1
+                raise
+            self.queue.ack(claim)
+            elapsed = time.monotonic() - start
+            with self._lock:
+                self.metrics["batches"] += 1
+                self.metrics["items"] += len(items)
+                self.metrics["seconds"] += elapsed
+            flushed += len(items)
+            logger.info(
+                "Flushed %d %s items in %.3fs, oldest waited %.3fs",
+                len(items),
+                self.name,
+                elapsed,
+                time.time() - min(added for added, item in items),
+            )
+
+
+def batched(name: str, **options):
+    """Turn the decorated bulk handler into a ``Batch`` named ``name``."""
+
+    def decorator(handler) -> Batch:
+        batch = Batch(name, handler, **options)
+        _batches[name] = batch
+        return batch
+
+    return decorator
+
+
+@celery_app.task(bind=True, max_retries=5)
+def flush_batch(self, name: str):
+    batch = _batches[name]
+    try:
+        return batch.flush()
+    except Exception as exc:
+        if self.request.retries >= self.max_retries:
+            # Given up for now: the requeued items wait for the next window.
+            batch.schedule_window()
+            raise
+        countdown = get_exponential_backoff_interval(
+            factor=1, retries=self.request.retries, maximum=600, full_jitter=True
+        )
+        raise self.retry(exc=exc, countdown=countdown)
@@ -0,0 +1,94 @@
+"""
+Celery beat scheduler keeping the periodic task schedule in memory.
+
+django-celery-beat's ``DatabaseScheduler`` queries ``PeriodicTasks`` every
+time it looks at its schedule to find out whether it changed.
+``CachedDatabaseScheduler`` instead compares a version number kept in the
+cache, bumped whenever django-celery-beat records a change (a periodic task or
+schedule saved or deleted), and reloads the schedule from the database only
+then. Without a shared (django-redis) cache it falls back to the database
+check.
+
+Crontab entries also run a stable, per-task delay of up to
+``CELERY_BEAT_CRONTAB_JITTER`` seconds after their time, so tasks sharing a
+crontab do not all fire in the same second.
+"""
+import copy
+import hashlib
+import uuid
+from datetime import timedelta
+
+from celery import schedules
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django_celery_beat.models import PeriodicTasks
+from django_celery_beat.schedulers import DatabaseScheduler, ModelEntry
+
+SCHEDULE_VERSION_CACHE_KEY = "celery-beat:schedule-version"
+# Crontab schedules are per minute, a longer delay could skip a run.
+MAX_JITTER = 59
+
+
+@receiver(post_save, sender=PeriodicTasks, dispatch_uid="bump_schedule_version")
+def bump_schedule_version(**kwargs):
+    # After commit, so the scheduler never reloads before it can see the change.
+    transaction.on_commit(
+        lambda: cache.set(SCHEDULE_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+    )
+
+
+def jitter(name: str) -> float:
+    """Seconds the crontab entry ``name`` runs late, stable across restarts."""
+    limit = min(settings.CELERY_BEAT_CRONTAB_JITTER, MAX_JITTER)
+    digest = int(hashlib.md5(name.encode()).hexdigest(), 16)
+    return digest % (limit * 1000 + 1) / 1000
+
+
+def delay(schedule: schedules.crontab, seconds: float) -> schedules.crontab:
+    """A copy of ``schedule`` that is due ``seconds`` after the original."""
+    delayed = copy.copy(schedule)
+    now = schedule.now
+    # Being due is judged against this clock, so running it late delays runs.
+    delayed.nowfun = lambda: now() - timedelta(seconds=seconds)
+    return delayed
+
+
+class JitteredModelEntry(ModelEntry):
+    schedule: schedules.BaseSchedule
+
+    def __init__(self, model, app=None):
+        super().__init__(model, app=app)
+        if isinstance(self.schedule, schedules.crontab):
+            self.schedule = delay(self.schedule, jitter(self.name))
+
+
+class CachedDatabaseScheduler(DatabaseScheduler):
+    Entry = JitteredModelEntry
+
+    _version = None
+
+    @property
+    def shared_cache(self) -> bool:
+        return settings.CACHES["default"]["BACKEND"].startswith("django_redis.")
+
+    def current_version(self) -> str:
+        version = cache.get(SCHEDULE_VERSION_CACHE_KEY)
+        if version is None:
+            # Never bumped yet, or evicted: start from a new version.
+            cache.add(SCHEDULE_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+            version = cache.get(SCHEDULE_VERSION_CACHE_KEY)
+        return version
+
+    def all_as_schedule(self):
+        if self.shared_cache:
+            # Taken before reading, so a change made meanwhile is not missed.
+            self._version = self.current_version()
+        return super().all_as_schedule()
+
+    def schedule_changed(self):
+        if not self.shared_cache:
+            return super().schedule_changed()
+        return self.current_version() != self._version
@@ -0,0 +1,134 @@
+"""
+Stampede-safe caching of expensive computations::
+
+    @cached("users:count", timeout=60)
+    def get_user_count():
+        ...
+
+    @cached(lambda days: f"users:signups:{days}", timeout=300)
+    def get_signups(days):
+        ...
+
+A value is stored with the time it took to compute and is recomputed *before*
+it expires, with a probability that grows as expiry approaches and with the
+compute time ("XFetch", Vattani et al.), so a hot key is normally refreshed by
+one caller while the others keep getting the cached value. ``beta`` above 1
+favours earlier refreshes, 0 disables them.
+
+When a value does need computing, concurrent callers in the same process wait
+for a single computation, and a short lock taken with ``cache.add`` (``SET NX``
+on Redis) lets one process compute while the others serve the value they
+already have or, if there is none, wait up to ``lock_timeout`` seconds for it.
+"""
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from django.core.cache import cache
+
+# (value, seconds it took to compute, expiry as a Unix timestamp)
+Entry = Tuple[Any, float, float]
+
+POLL_INTERVAL = 0.05
+
+_flights: Dict[str, threading.Lock] = {}
+_flights_lock = threading.Lock()
+
+
+@contextmanager
+def _single_flight(key: str):
+    with _flights_lock:
+        lock = _flights.setdefault(key, threading.Lock())
+    with lock:
+        yield
+    with _flights_lock:
+        if _flights.get(key) is lock:
+            del _flights[key]
+
+
+def _is_fresh(entry: Entry, beta: float) -> bool:
+    value, delta, expires = entry
+    # log() of a number in (0, 1] is <= 0, so this moves "now" forward.
+    return time.time() - delta * beta * math.log(1 - random.random()) < expires
+
+
+def _wait_for(key: str, timeout: float) -> Optional[Entry]:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def get_or_compute(
+    key: str,
+    compute: Callable[[], Any],
+    timeout: int,
+    beta: float = 1.0,
+    lock_timeout: int = 10,
+) -> Any:
+    """Return the cached value of ``key``, calling ``compute`` to refresh it."""
+    entry = cache.get(key)
+    if entry is not None and _is_fresh(entry, beta):
+        return entry[0]
+
+    with _single_flight(key):
+        latest = cache.get(key)
+        if latest is not None and latest != entry:
+            # Refreshed by another thread while this one waited.
+            return latest[0]
+
+        lock_key = f"{key}:lock"
+        locked = cache.add(lock_key, 1, lock_timeout)
+        if not locked:
+            # Another process is computing: serve what is there, or wait for it.
+            if latest is None:
+                latest = _wait_for(key, lock_timeout)
+            if latest is not None:
+                return latest[0]
+
+        try:
+            start = time.monotonic()
+            value = compute()
+            delta = time.monotonic() - start
+            cache.set(key, (value, delta, time.time() + timeout), timeout)
+        finally:
+            if locked:
+                cache.delete(lock_key)
+        return value
+
+
+def cached(
+    key: Union[str, Callable[..., str]],
+    timeout: int,
+    beta: float = 1.0,
+    lock_timeout: int = 10,
+):
+    """
+    Cache the decorated function's result under ``key`` for ``timeout`` seconds.
+
+    ``key`` is a string, or a callable taking the function's arguments and
+    returning one. Drop a value early with ``cache.delete(key)``.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if callable(key) else key
+            return get_or_compute(
+                cache_key,
+                lambda: func(*args, **kwargs),
+                timeout,
+                beta=beta,
+                lock_timeout=lock_timeout,
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,40 @@
+from calendar import timegm
+from functools import wraps
+from typing import Callable
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def conditional_on_modified(get_modified: Callable):
+    """
+    Answer conditional GETs from a timestamp before the view does any work.
+
+    ``get_modified(view, request, *args, **kwargs)`` returns when the resource last
+    changed, or ``None`` to fall through to the view (e.g. to let it 404). The
+    ETag and Last-Modified headers are derived from that timestamp, so a matching
+    ``If-None-Match``/``If-Modified-Since`` gets a 304 without serialization.
+    """
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            modified = get_modified(view, request, *args, **kwargs)
+            if modified is None:
+                return view_method(view, request, *args, **kwargs)
+
+            etag = quote_etag(f"{modified.timestamp():.6f}")
+            last_modified = timegm(modified.utctimetuple())
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = view_method(view, request, *args, **kwargs)
+            if request.method in ("GET", "HEAD") and response.status_code in (200, 304):
+                response["ETag"] = etag
+                response["Last-Modified"] = http_date(last_modified)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,128 @@
+"""
+Celery tasks that run once per set of arguments at a time::
+
+    @celery_app.task(base=IdempotentTask, ignore_result=False, result_window=60)
+    def build_report(year):
+        ...
+
+The task name and arguments make an idempotency key. Sending the task while a
+copy with the same key is queued or running sends nothing and returns that
+copy's ``AsyncResult`` instead, so duplicates merge into it. A worker runs the
+task only while holding a lease lock on the key, renewed every third of
+``lease`` seconds for as long as the task runs, so a copy sent some other way
+(or after the queued marker expired) is skipped rather than run twice. The
+(JSON-serializable) result is then kept for ``result_window`` seconds and
+returned to anyone sending the task again meanwhile, without running it.
+
+The keys live in the default cache's Redis. Without django-redis the tasks
+behave like any other.
+"""
+import hashlib
+import json
+import logging
+import threading
+import uuid
+from typing import Optional
+
+from celery import Task
+from celery.exceptions import Retry
+from celery.result import EagerResult
+from django.conf import settings
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+
+def idempotency_key(name: str, args, kwargs) -> str:
+    arguments = json.dumps([args or [], kwargs or {}], sort_keys=True, default=str)
+    return f"{name}:{hashlib.sha256(arguments.encode()).hexdigest()}"
+
+
+class IdempotentTask(Task):
+    key_prefix = "idempotency:"
+    # Seconds the lock and queued marker last without being renewed.
+    lease = 60
+    # Seconds the result is reused for, 0 not to keep it.
+    result_window = 0
+
+    @cached_property
+    def redis(self):
+        if not settings.CACHES["default"]["BACKEND"].startswith("django_redis."):
+            return None
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+
+    def keys(self, args, kwargs):
+        key = f"{self.key_prefix}{idempotency_key(self.name, args, kwargs)}"
+        return f"{key}:queued", f"{key}:lock", f"{key}:result"
+
+    def cached_result(self, result_key: str) -> Optional[list]:
+        value = self.redis.get(result_key)
+        # Wrapped in a list to tell a cached None from no result.
+        return None if value is None else [json.loads(value)]
+
+    def apply_async(self, args=None, kwargs=None, task_id=None, **options):
+        if self.redis is None:
+            return super().apply_async(args, kwargs, task_id=task_id, **options)
+        task_id = task_id or str(uuid.uuid4())
+        queued_key, _, result_key = self.keys(args, kwargs)
+        cached = self.cached_result(result_key)
+        if cached is not None:
+            return EagerResult(task_id, cached[0], "SUCCESS")
+        if not self.redis.set(queued_key, task_id, nx=True, px=int(self.lease * 1000)):
+            in_flight = self.redis.get(queued_key)
+            if in_flight is not None:
+                logger.info("%s is already queued as %s", self.name, in_flight)
+                return self.AsyncResult(in_flight.decode())
+        return super().apply_async(args, kwargs, task_id=task_id, **options)
+
+    def __call__(self, *args, **kwargs):
+        if self.redis is None:
+            return super().__call__(*args, **kwargs)
+        queued_key, lock_key, result_key = self.keys(args, kwargs)
+        cached = self.cached_result(result_key)
+        if cached is not None:
+            return cached[0]
+        # Not thread local, so the renewal thread can extend it.
+        lock = self.redis.lock(lock_key, timeout=self.lease, thread_local=False)
+        if not lock.acquire(blocking=False):
+            logger.info("Skipping %s, a copy is already running", self.name)
+            if self.redis.get(queued_key) == (self.request.id or "").encode():
+                self.redis.delete(queued_key)
+            return None
+
+        stop = threading.Event()
+        renewal = threading.Thread(target=self.renew, args=(lock, queued_key, stop))
+        renewal.daemon = True
+        renewal.start()
+        retrying = False
+        try:
+            result = super().__call__(*args, **kwargs)
+            if self.result_window:
+                self.redis.set(result_key, json.dumps(result), ex=self.result_window)
+            return result
+        except Retry:
+            # The retry is still queued: keep merging duplicates into it.
+            retrying = True
+            raise
+        finally:
+            stop.set()
+            renewal.join()
+            if not retrying:
+                self.redis.delete(queued_key)
+            self.release(lock)
+
+    def renew(self, lock, queued_key: str, stop: threading.Event):
+        while not stop.wait(self.lease / 3):
+            lock.reacquire()
+            self.redis.pexpire(queued_key, int(self.lease * 1000))
+
+    def release(self, lock):
+        from redis.exceptions import LockError
+
+        try:
+            lock.release()
+        except LockError:
+            # Renewal failed to keep up, another copy may have run meanwhile.
+            logger.warning("%s lost its lock before finishing", self.name)
@@ -0,0 +1,178 @@
+"""
+Logging off the request path.
+
+``QueueHandler`` only puts records on a queue; a ``QueueListener`` thread
+hands them to the real handlers, so formatting, writing to the console and
+sending error mail never hold up the thread that logged. Configure it with
+the handlers it feeds, which must sort before it by name (``dictConfig``
+creates handlers in name order). The queue holds up to ``queue_size`` records;
+past that, records are dropped rather than letting memory grow, and a warning
+saying how many is logged once there is room again::
+
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "json"},
+        "queue": {
+            "class": "{{ cookiecutter.project_slug }}.utils.log.QueueHandler",
+            "handlers": ["cfg://handlers.console"],
+            "filters": ["request_context"],
+        },
+    },
+
+``RequestContextMiddleware`` gives each request an ID (the ``X-Request-ID``
+header it came with, or a new one, sent back in the response), which
+``RequestContextFilter`` adds to records with the user's ID and the seconds
+since the request started. ``JSONFormatter`` writes records as one JSON object
+per line.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+from django.db import close_old_connections
+from django.utils.functional import empty
+
+REQUEST_ID_RE = re.compile(r"^[\w-]{1,64}$")
+QUEUE_SIZE = 10_000
+
+# (request ID, request, perf_counter() when it started) of the current request.
+_request: ContextVar[Optional[tuple]] = ContextVar("log_request", default=None)
+
+
+class RequestContextMiddleware:
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_id = request.META.get("HTTP_X_REQUEST_ID", "")
+        if not REQUEST_ID_RE.match(request_id):
+            request_id = uuid.uuid4().hex
+        token = _request.set((request_id, request, time.perf_counter()))
+        try:
+            response = self.get_response(request)
+        finally:
+            _request.reset(token)
+        response["X-Request-ID"] = request_id
+        return response
+
+
+class RequestContextFilter(logging.Filter):
+    """Add ``request_id``, ``user_id`` and ``elapsed`` (seconds) to records."""
+
+    def filter(self, record):
+        context = _request.get()
+        if context is None:
+            record.request_id = record.user_id = record.elapsed = None
+            return True
+        record.request_id, request, started = context
+        record.elapsed = round(time.perf_counter() - started, 6)
+        # Only a user already loaded: logging must not query the database.
+        user = getattr(request, "user", None)
+        loaded = user is not None and getattr(user, "_wrapped", None) is not empty
+        record.user_id = user.pk if loaded else None
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        data = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.thread,
+            "request_id": getattr(record, "request_id", None),
+            "user_id": getattr(record, "user_id", None),
+            "elapsed": getattr(record, "elapsed", None),
+        }
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+class QueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room in a full queue rather than fail to stop.
+        self.queue.put(self._sentinel)  # type: ignore
+
+    def handle(self, record):
+        try:
+            super().handle(record)  # type: ignore
+        finally:
+            # Handlers may have queried the database from this thread, which
+            # request_finished never cleans up after.
+            close_old_connections()
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, handlers: List[logging.Handler], queue_size: int = QUEUE_SIZE):
+        super().__init__(queue.Queue(queue_size))
+        # dictConfig resolves cfg:// references on indexing, not iterating.
+        self.handlers = [handlers[i] for i in range(len(handlers))]
+        self.queue_size = queue_size
+        self.dropped = self._reported = 0
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self.start()
+        # A forked child (gunicorn or Celery worker) has no listener thread.
+        os.register_at_fork(after_in_child=self.start)  # type: ignore
+        atexit.register(self.stop)
+
+    def start(self):
+        self.queue: queue.Queue = queue.Queue(self.queue_size)
+        self.listener = QueueListener(
+            self.queue, *self.handlers, respect_handler_level=True
+        )
+        self.listener.start()
+
+    def stop(self):
+        """Wait for the queued records to be handled."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def enqueue(self, record):
+        # Called with the handler's lock held.
+        try:
+            if self.dropped > self._reported:
+                self.queue.put_nowait(self._dropped_warning())
+                self._reported = self.dropped
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _dropped_warning(self) -> logging.LogRecord:
+        return self.prepare(
+            logging.makeLogRecord(
+                {
+                    "name": __name__,
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": "Dropped %d log records, the logging queue was full",
+                    "args": (self.dropped - self._reported,),
+                }
+            )
+        )
+
+    def prepare(self, record):
+        # The record stays in this process: unlike the base class, keep
+        # exc_info (and record.request) for the handlers, and only turn the
+        # message into a string before its arguments can change.
+        record.msg, record.args = record.getMessage(), None
+        request = getattr(record, "request", None)
+        if request is not None:
+            # Load the user now, on the request's thread and connection, rather
+            # than when the error report formats it on the listener thread.
+            try:
+                str(getattr(request, "user", ""))
+            except Exception:
+                pass
+        return record
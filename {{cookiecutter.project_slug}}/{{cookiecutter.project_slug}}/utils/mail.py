@@ -0,0 +1,327 @@
+"""
+Email delivery off the request path.
+
+``AsyncEmailBackend`` is set as ``EMAIL_BACKEND`` and only queues messages;
+they are delivered by ``ASYNC_EMAIL_BACKEND`` (SMTP, Mailgun, ...). With Celery
+each ``send_messages`` call becomes one ``send_email_messages`` task; without
+it, a small pool of daemon threads per process drains an in-memory queue, up to
+``BATCH_SIZE`` messages per connection. Either way allauth's verification mail
+and ``AdminEmailHandler`` no longer wait on the mail provider.
+
+``PooledSMTPEmailBackend`` is Django's SMTP backend reusing up to
+``EMAIL_POOL_SIZE`` authenticated connections per process instead of opening
+one for every ``send_messages`` call.
+"""
+import atexit
+import base64
+import logging
+import os
+import queue
+import smtplib
+import socket
+import threading
+import time
+from collections import deque
+from email.mime.base import MIMEBase
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, cast
+
+from django.conf import settings
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.backends.smtp import EmailBackend as SMTPEmailBackend
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+# Seconds a worker thread waits for more messages to share a connection with.
+BATCH_WAIT = 0.1
+THREADS = 2
+
+
+def serialize_message(message: EmailMessage) -> Dict[str, Any]:
+    """Turn ``message`` into JSON-serializable data for ``deserialize_message``."""
+    attachments = []
+    for attachment in message.attachments:
+        if isinstance(attachment, MIMEBase):
+            # Keeps the file but not any custom MIME headers.
+            attachment = (
+                attachment.get_filename(),
+                attachment.get_payload(decode=True),
+                attachment.get_content_type(),
+            )
+        filename, content, mimetype = attachment
+        if isinstance(content, bytes):
+            content = {"base64": base64.b64encode(content).decode("ascii")}
+        attachments.append([filename, content, mimetype])
+    return {
+        "subject": message.subject,
+        "body": message.body,
+        "from_email": message.from_email,
+        "to": message.to,
+        "cc": message.cc,
+        "bcc": message.bcc,
+        "reply_to": message.reply_to,
+        "headers": message.extra_headers,
+        "alternatives": getattr(message, "alternatives", []),
+        "attachments": attachments,
+        "content_subtype": message.content_subtype,
+    }
+
+
+def deserialize_message(data: Dict[str, Any]) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(
+        subject=data["subject"],
+        body=data["body"],
+        from_email=data["from_email"],
+        to=data["to"],
+        cc=data["cc"],
+        bcc=data["bcc"],
+        reply_to=data["reply_to"],
+        headers=data["headers"],
+    )
+    message.content_subtype = data["content_subtype"]
+    for content, mimetype in data["alternatives"]:
+        message.attach_alternative(content, mimetype)
+    for filename, content, mimetype in data["attachments"]:
+        if isinstance(content, dict):
+            content = base64.b64decode(content["base64"])
+        message.attach(filename, content, mimetype)
+    return message
+
+
+def _celery_task():
+    try:
+        from {{ cookiecutter.project_slug }}.users.tasks import send_email_messages
+    except ImportError:  # Celery is not used
+        return None
+    return send_email_messages
+
+
+def deliver(messages: List[EmailMessage]) -> int:
+    """Send ``messages`` with ``ASYNC_EMAIL_BACKEND`` over one connection."""
+    connection = get_connection(settings.ASYNC_EMAIL_BACKEND)
+    return connection.send_messages(messages) or 0
+
+
+class _Outbox:
+    """In-process queue drained by daemon threads, used when Celery is not."""
+
+    def __init__(self, threads: int = THREADS):
+        self.queue: queue.Queue = queue.Queue()
+        for n in range(threads):
+            threading.Thread(target=self.run, name=f"email-{n}", daemon=True).start()
+        atexit.register(self.join, timeout=settings.EMAIL_TIMEOUT or 10)
+
+    def put(self, messages: List[EmailMessage]):
+        for message in messages:
+            self.queue.put(message)
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            try:
+                while len(batch) < BATCH_SIZE:
+                    batch.append(self.queue.get(timeout=BATCH_WAIT))
+            except queue.Empty:
+                pass
+            try:
+                deliver(batch)
+            except Exception:
+                logger.exception("Could not send %d email messages", len(batch))
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message was handed to the backend."""
+        with self.queue.all_tasks_done:
+            return self.queue.all_tasks_done.wait_for(
+                lambda: not self.queue.unfinished_tasks, timeout
+            )
+
+
+_outbox: Optional[_Outbox] = None
+_outbox_lock = threading.Lock()
+
+
+def get_outbox() -> _Outbox:
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            _outbox = _Outbox()
+        return _outbox
+
+
+class AsyncEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        messages = [message for message in email_messages if message.recipients()]
+        if not messages:
+            return 0
+        task = _celery_task()
+        if task is not None:
+            try:
+                task.delay([serialize_message(message) for message in messages])
+                return len(messages)
+            except Exception:
+                logger.exception("Could not queue email, sending from this process")
+        get_outbox().put(messages)
+        return len(messages)
+
+
+class SMTPConnectionPool:
+    """
+    A bounded, thread-safe set of open SMTP connections to one server.
+
+    Connections idle for more than ``check_after`` seconds are checked with
+    NOOP before being handed out again and replaced if the server has dropped
+    them.
+    """
+
+    def __init__(self, size: int, check_after: float = 30):
+        self.size = size
+        self.check_after = check_after
+        self.open_connections = 0
+        self._idle: Deque[Tuple[smtplib.SMTP, float]] = deque()
+        self._available = threading.Condition()
+
+    def acquire(
+        self, connect: Callable[[], smtplib.SMTP], timeout: Optional[float] = None
+    ) -> smtplib.SMTP:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        connection: Optional[smtplib.SMTP]
+        while True:
+            with self._available:
+                while not self._idle and self.open_connections >= self.size:
+                    remaining = (
+                        None if deadline is None else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        raise smtplib.SMTPServerDisconnected(
+                            "Timed out waiting for a pooled SMTP connection"
+                        )
+                    self._available.wait(remaining)
+                if self._idle:
+                    connection, released = self._idle.pop()
+                else:
+                    self.open_connections += 1
+                    connection = None
+
+            if connection is None:
+                try:
+                    return connect()
+                except BaseException:
+                    self._discard()
+                    raise
+            if time.monotonic() - released < self.check_after or _is_alive(connection):
+                return connection
+            _quit(connection)
+            self._discard()
+
+    def release(self, connection: smtplib.SMTP, healthy: bool = True):
+        if not healthy:
+            _quit(connection)
+            self._discard()
+            return
+        with self._available:
+            # Reused last in, first out: the likeliest to still be open.
+            self._idle.append((connection, time.monotonic()))
+            self._available.notify()
+
+    def close(self):
+        with self._available:
+            idle, self._idle = list(self._idle), deque()
+            self.open_connections -= len(idle)
+            self._available.notify_all()
+        for connection, released in idle:
+            _quit(connection)
+
+    def _discard(self):
+        with self._available:
+            self.open_connections -= 1
+            self._available.notify()
+
+
+def _is_alive(connection: smtplib.SMTP) -> bool:
+    try:
+        return connection.noop()[0] == 250
+    except (smtplib.SMTPException, OSError):
+        return False
+
+
+def _quit(connection: smtplib.SMTP):
+    try:
+        connection.quit()
+    except (smtplib.SMTPException, OSError):
+        connection.close()
+
+
+_pools: Dict[Tuple, SMTPConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+class PooledSMTPEmailBackend(SMTPEmailBackend):
+    """Django's SMTP backend, borrowing connections from a per-process pool."""
+
+    fail_silently: bool
+    _failed = False
+
+    @property
+    def pool(self) -> SMTPConnectionPool:
+        # The pid keeps a forked worker from sharing its parent's sockets.
+        key = (
+            os.getpid(),
+            self.host,
+            self.port,
+            self.username,
+            self.use_tls,
+            self.use_ssl,
+        )
+        with _pools_lock:
+            if key not in _pools:
+                _pools[key] = SMTPConnectionPool(settings.EMAIL_POOL_SIZE)
+            return _pools[key]
+
+    def open(self):
+        if self.connection:
+            return False
+        try:
+            self.connection = self.pool.acquire(self._connect, timeout=self.timeout)
+        except (smtplib.SMTPException, socket.error):
+            if not self.fail_silently:
+                raise
+            return None
+        return True
+
+    def _connect(self) -> smtplib.SMTP:
+        fail_silently = self.fail_silently
+        # Let connection errors reach the pool so it can free the slot.
+        self.fail_silently = False
+        try:
+            super().open()
+        finally:
+            self.fail_silently = fail_silently
+        connection, self.connection = self.connection, None
+        return cast(smtplib.SMTP, connection)
+
+    def close(self):
+        """Return the connection to the pool rather than quitting."""
+        if self.connection is None:
+            return
+        connection, self.connection = self.connection, None
+        self.pool.release(connection, healthy=not self._failed)
+
+    def send_messages(self, email_messages):
+        self._failed = False
+        try:
+            return super().send_messages(email_messages)
+        except BaseException:
+            self._failed = True
+            self.close()
+            raise
+
+    def _send(self, email_message):
+        sent = super()._send(email_message)  # type: ignore
+        if not sent and email_message.recipients():
+            # Failed silently: the connection may be the reason.
+            self._failed = True
+        return sent
@@ -0,0 +1,152 @@
+"""
+Prometheus metrics for requests, per URL name and method.
+
+``RequestMetricsMiddleware`` records each request's latency, number and total
+time of database queries, cache hits and misses (counted by
+``InstrumentedRedisClient``, the django-redis client class) and response size.
+``metrics_view`` serves them to a scraper sending ``METRICS_TOKEN`` as a
+bearer token.
+
+Metrics live in process memory unless the ``prometheus_multiproc_dir``
+environment variable names a directory, as the production start script and the
+Procfile set for gunicorn: every process (each gunicorn worker) then writes its
+own memory-mapped files there, and ``metrics_view`` sums them up in whichever
+worker serves it. ``config/gunicorn.py`` drops the gauges of exited workers.
+"""
+import os
+import time
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django_redis.client import DefaultClient
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+
+from {{ cookiecutter.project_slug }}.utils.query_budget import QueryRecorder
+
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+LABELS = ["view", "method"]
+
+LATENCY = Histogram(
+    "django_request_duration_seconds", "Time to respond to requests.", LABELS
+)
+QUERIES = Histogram(
+    "django_request_db_queries",
+    "Database queries run per request.",
+    LABELS,
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, float("inf")),
+)
+QUERY_TIME = Histogram(
+    "django_request_db_query_duration_seconds",
+    "Time spent in database queries per request.",
+    LABELS,
+)
+CACHE = Counter(
+    "django_request_cache_gets_total",
+    "Cache lookups made by requests, by result (hit or miss).",
+    LABELS + ["result"],
+)
+RESPONSE_SIZE = Histogram(
+    "django_response_size_bytes",
+    "Size of response bodies, streaming responses excepted.",
+    LABELS,
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, float("inf")),
+)
+
+
+class RequestStats:
+    def __init__(self):
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+# Stats of the request being handled, for the cache client to add to.
+_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+_missing = object()
+
+
+class InstrumentedRedisClient(DefaultClient):
+    """django-redis client counting the hits and misses of each request."""
+
+    def get(self, key, default=None, version=None, client=None):
+        value = super().get(key, default=_missing, version=version, client=client)
+        stats = _stats.get()
+        if stats is not None:
+            if value is _missing:
+                stats.cache_misses += 1
+            else:
+                stats.cache_hits += 1
+        return default if value is _missing else value
+
+    def get_many(self, keys, version=None, client=None):
+        values = super().get_many(keys, version=version, client=client)
+        stats = _stats.get()
+        if stats is not None:
+            stats.cache_hits += len(values)
+            stats.cache_misses += len(keys) - len(values)
+        return values
+
+
+class RequestMetricsMiddleware:
+    """Record request metrics; goes first in ``MIDDLEWARE`` to time the others."""
+
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _stats.set(stats)
+        start = time.perf_counter()
+        try:
+            with QueryRecorder() as queries:
+                response = self.get_response(request)
+        finally:
+            _stats.reset(token)
+        latency = time.perf_counter() - start
+
+        # URL names rather than paths, which would make a series per object.
+        match = request.resolver_match
+        labels = (
+            match.view_name if match else "<unresolved>",
+            request.method if request.method in METHODS else "<other>",
+        )
+        LATENCY.labels(*labels).observe(latency)
+        QUERIES.labels(*labels).observe(len(queries))
+        QUERY_TIME.labels(*labels).observe(queries.duration)
+        if stats.cache_hits:
+            CACHE.labels(*labels, "hit").inc(stats.cache_hits)
+        if stats.cache_misses:
+            CACHE.labels(*labels, "miss").inc(stats.cache_misses)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(*labels).observe(len(response.content))
+        return response
+
+
+def get_registry():
+    if "prometheus_multiproc_dir" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request):
+    """Metrics in the Prometheus text format, for a scraper with the token."""
+    authorization = request.META.get("HTTP_AUTHORIZATION", "")
+    if not settings.METRICS_TOKEN or not constant_time_compare(
+        authorization, f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise Http404
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
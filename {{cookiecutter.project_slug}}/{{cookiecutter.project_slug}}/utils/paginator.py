@@ -0,0 +1,39 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# Below this many rows an exact COUNT(*) is cheap and the estimate least reliable.
+ESTIMATE_THRESHOLD = 100_000
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that takes the row count of unfiltered querysets from PostgreSQL's
+    planner statistics instead of running ``COUNT(*)`` over the whole table.
+
+    The estimate (``pg_class.reltuples``) is refreshed by ``ANALYZE`` and
+    autovacuum, so page counts on large tables are approximate. Filtered
+    querysets, small tables and other databases are counted exactly.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = self.estimated_count()
+        if estimate is not None and estimate >= ESTIMATE_THRESHOLD:
+            return estimate
+        return super().count
+
+    def estimated_count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, "query") or queryset.query.has_filters():
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row else None
@@ -0,0 +1,200 @@
+"""
+Sampling profiler for production requests.
+
+``ProfilerMiddleware`` profiles a request when it carries an ``X-Profile``
+header signed by ``manage.py profile_token``, when it is picked at random
+(``PROFILER_SAMPLE_RATE``), or once it has run for ``PROFILER_LATENCY_THRESHOLD``
+seconds. A single thread per process takes a sample of each profiled
+request's Python stack every ``PROFILER_INTERVAL`` seconds; with no profiled
+request it sleeps, and with sampling and the threshold off a request costs a
+header lookup. Stacks are written in the collapsed format flamegraph.pl and
+speedscope read, one ``.folded`` file per request in ``PROFILER_DIR``, oldest
+files deleted to keep the directory under ``PROFILER_MAX_BYTES``.
+"""
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.core import signing
+from django.utils.text import slugify
+
+logger = logging.getLogger(__name__)
+
+TOKEN_SALT = "{{ cookiecutter.project_slug }}.utils.profiler"
+# Seconds a profile_token is accepted for.
+TOKEN_MAX_AGE = 60 * 60
+
+
+def make_token() -> str:
+    return signing.dumps("profile", salt=TOKEN_SALT)
+
+
+def is_valid_token(token: str) -> bool:
+    try:
+        return signing.loads(token, salt=TOKEN_SALT, max_age=TOKEN_MAX_AGE) == "profile"
+    except signing.BadSignature:
+        return False
+
+
+class Profile:
+    def __init__(self, sample_after: float):
+        # perf_counter() from which the request is sampled.
+        self.sample_after = sample_after
+        self.stacks: Counter = Counter()
+
+    def add(self, frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+            frame = frame.f_back
+        self.stacks[";".join(reversed(names))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+class Sampler(threading.Thread):
+    """Samples the stacks of the threads handling profiled requests."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="profiler", daemon=True)
+        self.interval = interval
+        self.profiles: Dict[int, Profile] = {}
+        self.lock = threading.Lock()
+        self.busy = threading.Event()
+        # Threads do not survive a fork: each (gunicorn worker) process starts its own.
+        self.pid = os.getpid()
+
+    def add(self, thread_id: int, profile: Profile):
+        with self.lock:
+            self.profiles[thread_id] = profile
+            self.busy.set()
+
+    def remove(self, thread_id: int):
+        with self.lock:
+            self.profiles.pop(thread_id, None)
+
+    def run(self):
+        while True:
+            # Sleeps until there are requests to profile.
+            self.busy.wait()
+            time.sleep(self.interval)
+            with self.lock:
+                profiles = list(self.profiles.items())
+                if not profiles:
+                    self.busy.clear()
+                    continue
+            now = time.perf_counter()
+            frames = sys._current_frames()
+            for thread_id, profile in profiles:
+                frame = frames.get(thread_id)
+                if frame is not None and now >= profile.sample_after:
+                    profile.add(frame)
+
+
+_sampler: Optional[Sampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler() -> Sampler:
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None or _sampler.pid != os.getpid():
+            _sampler = Sampler(settings.PROFILER_INTERVAL)
+            _sampler.start()
+        return _sampler
+
+
+def _stat(path: Path) -> Optional[os.stat_result]:
+    try:
+        return path.stat()
+    except FileNotFoundError:  # Pruned by another worker.
+        return None
+
+
+def save(profile: Profile, name: str) -> Optional[Path]:
+    """Write ``profile`` to ``PROFILER_DIR``, deleting the oldest to make room."""
+    data = profile.collapsed().encode()
+    limit = settings.PROFILER_MAX_BYTES
+    if len(data) > limit:
+        return None
+    directory = Path(settings.PROFILER_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    files = []
+    for path in directory.glob("*.folded"):
+        stat = _stat(path)
+        if stat is not None:
+            files.append((stat.st_mtime, stat.st_size, path))
+    files.sort()
+    total = sum(size for mtime, size, path in files)
+    while files and total + len(data) > limit:
+        mtime, size, oldest = files.pop(0)
+        total -= size
+        try:
+            oldest.unlink()
+        except FileNotFoundError:
+            pass
+    path = directory / f"{name}.folded"
+    path.write_bytes(data)
+    return path
+
+
+class ProfilerMiddleware:
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        threshold = settings.PROFILER_LATENCY_THRESHOLD
+        start = time.perf_counter()
+        if self.requested(request) or (
+            settings.PROFILER_SAMPLE_RATE
+            and random.random() < settings.PROFILER_SAMPLE_RATE
+        ):
+            profile = Profile(sample_after=start)
+        elif threshold:
+            profile = Profile(sample_after=start + threshold)
+        else:
+            return self.get_response(request)
+
+        sampler = get_sampler()
+        thread_id = threading.get_ident()
+        sampler.add(thread_id, profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            sampler.remove(thread_id)
+        elapsed = time.perf_counter() - start
+
+        if profile.stacks:
+            match = request.resolver_match
+            view = slugify(match.view_name if match else request.path) or "root"
+            name = (
+                f"{time.strftime('%Y%m%dT%H%M%S')}-{view}-{elapsed * 1000:.0f}ms-"
+                f"{uuid.uuid4().hex[:8]}"
+            )
+            try:
+                path = save(profile, name)
+            except OSError:
+                logger.exception("Could not save the profile of %s", request.path)
+                return response
+            logger.info(
+                "Profiled %s %s (%.3fs) to %s",
+                request.method,
+                request.path,
+                elapsed,
+                path or "nowhere: larger than PROFILER_MAX_BYTES",
+            )
+        return response
+
+    def requested(self, request) -> bool:
+        token = request.META.get("HTTP_X_PROFILE")
+        return bool(token) and is_valid_token(token)
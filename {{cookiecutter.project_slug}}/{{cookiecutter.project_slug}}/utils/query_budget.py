@@ -0,0 +1,141 @@
+"""
+Per-view SQL query budgets.
+
+Views declare how many queries a single request may run, either with the
+``query_budget`` decorator or a ``query_budget`` class attribute. Viewsets and
+class-based views may map action names (or lowercase HTTP methods) to budgets::
+
+    @query_budget(2)
+    def my_view(request):
+        ...
+
+    class UserViewSet(GenericViewSet):
+        query_budget = {"list": 3, "retrieve": 3}
+
+``QueryBudgetMiddleware`` enforces them. It is enabled for the test suite by
+``conftest.py`` so that N+1 regressions fail tests instead of reaching
+production.
+"""
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from typing import Any, Callable, List, Mapping, Optional
+
+from django.db import connections
+
+TRANSACTION_CONTROL_RE = re.compile(
+    r"^\s*(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT|BEGIN|COMMIT|ROLLBACK)\b",
+    re.IGNORECASE,
+)
+STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+PLACEHOLDER_LIST_RE = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(limit):
+    """Declare the maximum number of queries a view may run per request."""
+
+    def decorator(view):
+        view.query_budget = limit
+        return view
+
+    return decorator
+
+
+def get_query_budget(view_func: Callable, method: str) -> Optional[int]:
+    """Return the budget declared for ``view_func`` handling ``method``, if any."""
+    budget = getattr(view_func, "query_budget", None)
+    if budget is None:
+        # Django's as_view() exposes the class as ``view_class``, DRF's as ``cls``.
+        view_class = getattr(view_func, "view_class", None) or getattr(
+            view_func, "cls", None
+        )
+        budget = getattr(view_class, "query_budget", None)
+    if isinstance(budget, Mapping):
+        method = method.lower()
+        actions = getattr(view_func, "actions", None) or {}
+        budget = budget.get(actions.get(method, method))
+    return budget
+
+
+def _view_name(view_func: Any) -> str:
+    view_class = getattr(view_func, "view_class", None) or getattr(
+        view_func, "cls", None
+    )
+    return getattr(view_class or view_func, "__qualname__", repr(view_func))
+
+
+def fingerprint(sql: str) -> str:
+    """Normalise ``sql`` so that queries differing only by literals group together."""
+    sql = STRING_LITERAL_RE.sub("?", sql)
+    sql = NUMBER_LITERAL_RE.sub("?", sql)
+    sql = PLACEHOLDER_LIST_RE.sub("(...)", sql)
+    return WHITESPACE_RE.sub(" ", sql).strip()
+
+
+class QueryRecorder:
+    """
+    Record every statement run on any database connection, minus transaction
+    control, and the total time spent running them.
+    """
+
+    def __init__(self):
+        self.queries: List[str] = []
+        self.duration = 0.0
+        self._stack = ExitStack()
+
+    def __enter__(self):
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._stack.__exit__(*exc_info)
+
+    def __call__(self, execute, sql, params, many, context):
+        if not TRANSACTION_CONTROL_RE.match(sql):
+            self.queries.append(sql)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+
+    def __len__(self):
+        return len(self.queries)
+
+    def report(self) -> str:
+        """Return the recorded queries grouped by fingerprint, most frequent first."""
+        groups = Counter(fingerprint(sql) for sql in self.queries)
+        return "\n".join(f"  {count}x {sql}" for sql, count in groups.most_common())
+
+
+class QueryBudgetMiddleware:
+    """Fail the request when the resolved view runs more queries than its budget."""
+
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+
+        budget = getattr(request, "_query_budget", None)
+        if budget is not None and len(recorder) > budget:
+            raise QueryBudgetExceeded(
+                f"{request.method} {request.path} ran {len(recorder)} queries, "
+                f"its view ({request._query_budget_view}) allows {budget}:\n"
+                f"{recorder.report()}"
+            )
+        return response
+
+    def process_view(self, request, view_func: Callable, view_args, view_kwargs):
+        request._query_budget = get_query_budget(view_func, request.method)
+        request._query_budget_view = _view_name(view_func)
+        return None
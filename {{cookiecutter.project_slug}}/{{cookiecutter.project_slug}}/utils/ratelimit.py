@@ -0,0 +1,158 @@
+"""
+Token bucket rate limiting.
+
+A bucket holds up to ``limit`` tokens and refills at ``limit`` per ``period``
+seconds; every ``hit`` takes one token or is refused. That allows short bursts
+up to ``limit`` while capping the sustained rate, like a sliding window
+without storing a timestamp per request::
+
+    result = get_limiter().hit("login:ip:192.0.2.1", *parse_rate("10/m"))
+    if not result.allowed:
+        ...  # retry after result.retry_after seconds
+
+With django-redis as the default cache each check is one ``EVALSHA`` of an
+atomic Lua script shared by all processes. Otherwise, or while Redis is
+unreachable, buckets are kept in process memory.
+"""
+import logging
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DURATIONS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call("HMSET", KEYS[1], "tokens", tokens, "ts", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+-- Lua numbers become integers in replies, so send the fractions as strings.
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    remaining: float
+    retry_after: float
+
+
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """Turn ``"<limit>/<s|m|h|d>"`` (DRF's format) into ``(limit, seconds)``."""
+    limit, period = rate.split("/")
+    return int(limit), DURATIONS[period[0]]
+
+
+def _take(
+    tokens: float, last: float, now: float, limit: int, period: float
+) -> Tuple[RateLimitResult, float]:
+    rate = limit / period
+    tokens = min(limit, tokens + max(0.0, now - last) * rate)
+    if tokens >= 1:
+        return RateLimitResult(True, tokens - 1, 0.0), tokens - 1
+    return RateLimitResult(False, tokens, (1 - tokens) / rate), tokens
+
+
+class MemoryRateLimiter:
+    """Per-process buckets; limits are per process rather than global."""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, period: float) -> RateLimitResult:
+        now = time.time()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (limit, now))
+            result, tokens = _take(tokens, last, now, limit, period)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > 100_000:
+                self._evict(now, period)
+        return result
+
+    def _evict(self, now: float, period: float):
+        # Buckets untouched for a whole period are full again: drop them.
+        self._buckets = {
+            key: bucket
+            for key, bucket in self._buckets.items()
+            if now - bucket[1] < period
+        }
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisRateLimiter:
+    key_prefix = "ratelimit:"
+
+    def __init__(self, fallback: MemoryRateLimiter):
+        from django_redis import get_redis_connection
+
+        self.redis = get_redis_connection("default")
+        self.script = self.redis.register_script(TOKEN_BUCKET_SCRIPT)
+        self.fallback = fallback
+
+    def hit(self, key: str, limit: int, period: float) -> RateLimitResult:
+        from redis.exceptions import RedisError
+
+        try:
+            allowed, tokens, retry_after = self.script(
+                keys=[f"{self.key_prefix}{key}"],
+                args=[limit, limit / period, time.time()],
+            )
+        except RedisError:
+            logger.warning("Redis is unavailable, rate limiting in memory")
+            return self.fallback.hit(key, limit, period)
+        return RateLimitResult(bool(allowed), float(tokens), float(retry_after))
+
+    def reset(self):
+        self.fallback.reset()
+        for key in self.redis.scan_iter(f"{self.key_prefix}*"):
+            self.redis.delete(key)
+
+
+_limiter: Optional[Union[MemoryRateLimiter, RedisRateLimiter]] = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter():
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            memory = MemoryRateLimiter()
+            if settings.CACHES["default"]["BACKEND"].startswith("django_redis."):
+                _limiter = RedisRateLimiter(memory)
+            else:
+                _limiter = memory
+        return _limiter
+
+
+def client_ip(request) -> Optional[str]:
+    """
+    The client's address, taken from X-Forwarded-For when
+    ``RATELIMIT_NUM_PROXIES`` trusted proxies sit in front of Django.
+    """
+    num_proxies = settings.RATELIMIT_NUM_PROXIES
+    forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
+    if num_proxies and forwarded_for:
+        addresses = [address.strip() for address in forwarded_for.split(",")]
+        return addresses[-min(num_proxies, len(addresses))]
+    return request.META.get("REMOTE_ADDR")
@@ -0,0 +1,155 @@
+import time
+from unittest.mock import Mock, call, patch
+
+import fakeredis
+import pytest
+
+from {{ cookiecutter.project_slug }}.users.models import User
+from {{ cookiecutter.project_slug }}.users.tests.factories import UserFactory
+from {{ cookiecutter.project_slug }}.utils.batching import (
+    Batch,
+    BatchFull,
+    RedisQueue,
+    batched,
+    flush_batch,
+)
+
+
+def rename(user_ids):
+    User.objects.filter(pk__in=user_ids).update(name="Renamed")
+
+
+class TestBatch:
+    def test_flushes_when_full(self):
+        handler = Mock()
+        batch = Batch("test", handler, size=2, window=60)
+
+        with patch("threading.Timer"):
+            batch.add(1)
+            handler.assert_not_called()
+            batch.add_many([2, 3])
+
+        assert handler.call_args_list == [call([1, 2]), call([3])]
+        assert batch.flush() == 0
+        assert batch.metrics["batches"] == 2
+        assert batch.metrics["items"] == 3
+
+    def test_window(self):
+        batch = Batch("test", Mock(), size=10, window=5)
+
+        with patch("threading.Timer") as timer:
+            batch.add(1)
+            batch.add(2)
+
+        timer.assert_called_once_with(5, batch._flush_quietly)
+
+    def test_backpressure(self):
+        batch = Batch("test", Mock(), size=10, max_pending=2)
+
+        with patch("threading.Timer"):
+            batch.add_many([1, 2])
+            with pytest.raises(BatchFull):
+                batch.add(3)
+
+    def test_failed_items_are_requeued(self):
+        handler = Mock(side_effect=[ValueError, None])
+        batch = Batch("test", handler, size=10)
+        with patch("threading.Timer"):
+            batch.add_many([1, 2])
+
+        with pytest.raises(ValueError):
+            batch.flush()
+
+        assert batch.metrics["failures"] == 1
+        assert batch.flush() == 2
+        handler.assert_called_with([1, 2])
+
+    def test_window_rescheduled_after_failure(self):
+        batch = Batch("test", Mock(side_effect=ValueError), size=10, window=5)
+
+        with patch("threading.Timer") as timer:
+            batch.add(1)
+            batch._flush_quietly()
+            batch.add(2)
+
+        assert timer.call_args_list == [call(5, batch._flush_quietly)] * 2
+        assert len(batch.queue) == 2
+
+
+@pytest.fixture
+def redis_queue() -> RedisQueue:
+    redis = fakeredis.FakeStrictRedis()
+    with patch("django_redis.get_redis_connection", return_value=redis):
+        return RedisQueue("test")
+
+
+class TestRedisQueue:
+    def test_claim_and_ack(self, redis_queue: RedisQueue):
+        redis_queue.push([(1.0, "a"), (2.0, "b"), (3.0, "c")])
+
+        assert redis_queue.claim(2, "claim", lease=60) == [(1.0, "a"), (2.0, "b")]
+        assert len(redis_queue) == 1
+        assert redis_queue.redis.llen(f"{redis_queue.processing_key}:claim") == 2
+
+        redis_queue.ack("claim")
+
+        assert not redis_queue.redis.exists(f"{redis_queue.processing_key}:claim")
+        assert not redis_queue.redis.zcard(redis_queue.processing_key)
+
+    def test_requeue_keeps_order(self, redis_queue: RedisQueue):
+        redis_queue.push([(1.0, "a"), (2.0, "b"), (3.0, "c")])
+        redis_queue.claim(2, "claim", lease=60)
+
+        redis_queue.requeue("claim")
+
+        assert redis_queue.claim(3, "again", lease=60) == [
+            (1.0, "a"),
+            (2.0, "b"),
+            (3.0, "c"),
+        ]
+
+    def test_recovers_expired_leases(self, redis_queue: RedisQueue):
+        redis_queue.push([(1.0, "a"), (2.0, "b")])
+        redis_queue.claim(1, "died", lease=0)
+        redis_queue.claim(1, "running", lease=60)
+        time.sleep(0.01)
+
+        redis_queue.recover()
+
+        assert redis_queue.claim(10, "next", lease=60) == [(1.0, "a")]
+
+    def test_schedule(self, redis_queue: RedisQueue):
+        assert redis_queue.schedule(60)
+        assert not redis_queue.schedule(60)
+
+        redis_queue.unschedule()
+
+        assert redis_queue.schedule(60)
+
+
+@pytest.mark.django_db
+def test_bulk_update_task(settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    users = UserFactory.create_batch(3)
+    batch = batched("test:rename", size=100)(rename)
+    with patch("threading.Timer"):
+        for user in users:
+            batch.add(user.pk)
+
+    assert flush_batch.delay("test:rename").result == 3
+
+    assert set(User.objects.values_list("name", flat=True)) == {"Renamed"}
+
+
+def test_task_gives_up_until_next_window(settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    handler = Mock(side_effect=ValueError)
+    batch = batched("test:failing", size=100, window=5)(handler)
+    with patch("threading.Timer") as timer:
+        batch.add(1)
+
+        assert flush_batch.delay("test:failing").failed()
+
+    assert handler.call_count == flush_batch.max_retries + 1
+    assert timer.call_args_list == [call(5, batch._flush_quietly)] * 2
+    assert len(batch.queue) == 1
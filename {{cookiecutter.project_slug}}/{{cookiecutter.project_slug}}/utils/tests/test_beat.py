@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+from typing import Iterator
+
+import pytest
+from celery import schedules
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django_celery_beat.models import CrontabSchedule, IntervalSchedule, PeriodicTask
+
+from config import celery_app
+from {{ cookiecutter.project_slug }}.utils.beat import (
+    CachedDatabaseScheduler,
+    JitteredModelEntry,
+    delay,
+    jitter,
+)
+
+
+class TestJitter:
+    def test_stable_and_bounded(self, settings):
+        settings.CELERY_BEAT_CRONTAB_JITTER = 30
+
+        assert jitter("a") == jitter("a")
+        assert jitter("a") != jitter("b")
+        assert all(0 <= jitter(str(n)) <= 30 for n in range(100))
+
+    def test_disabled(self, settings):
+        settings.CELERY_BEAT_CRONTAB_JITTER = 0
+
+        assert jitter("a") == 0
+
+    def test_delay(self):
+        now = datetime(2020, 1, 1, 12, 0, 10, tzinfo=timezone.utc)
+        schedule = schedules.crontab(minute=0, nowfun=lambda: now)
+        last_run_at = now - timedelta(hours=1, seconds=10)
+
+        assert schedule.is_due(last_run_at).is_due
+        due, next_in = delay(schedule, 30).is_due(last_run_at)
+        assert not due
+        assert next_in == pytest.approx(20)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCachedDatabaseScheduler:
+    @pytest.fixture
+    def scheduler(self, monkeypatch) -> Iterator[CachedDatabaseScheduler]:
+        monkeypatch.setattr(CachedDatabaseScheduler, "shared_cache", True)
+        scheduler = CachedDatabaseScheduler(app=celery_app)
+        scheduler.schedule
+        yield scheduler
+        # Not at exit, once the test database is gone.
+        scheduler._finalize.cancel()
+
+    def test_unchanged_without_queries(self, scheduler: CachedDatabaseScheduler):
+        with CaptureQueriesContext(connection) as queries:
+            assert not scheduler.schedule_changed()
+
+        assert len(queries) == 0
+
+    def test_reloads_on_change(self, scheduler: CachedDatabaseScheduler):
+        PeriodicTask.objects.create(
+            name="every-minute",
+            task="celery.backend_cleanup",
+            interval=IntervalSchedule.objects.create(
+                every=1, period=IntervalSchedule.MINUTES
+            ),
+        )
+
+        assert scheduler.schedule_changed()
+        assert "every-minute" in scheduler.schedule
+        assert not scheduler.schedule_changed()
+
+    def test_crontab_entries_are_delayed(self, settings):
+        settings.CELERY_BEAT_CRONTAB_JITTER = 30
+        model = PeriodicTask.objects.create(
+            name="nightly",
+            task="celery.backend_cleanup",
+            crontab=CrontabSchedule.objects.create(minute="0", hour="4"),
+        )
+
+        entry = JitteredModelEntry(model, app=celery_app)
+
+        lag = timezone.now() - entry.schedule.now()
+        assert lag.total_seconds() == pytest.approx(jitter("nightly"), abs=1)
@@ -0,0 +1,73 @@
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+
+from {{ cookiecutter.project_slug }}.utils.cache import cached, get_or_compute
+
+
+class TestCached:
+    def test_caches(self):
+        compute = Mock(return_value=42)
+        cached_compute = cached("answer", timeout=60)(compute)
+
+        assert cached_compute() == 42
+        assert cached_compute() == 42
+        compute.assert_called_once_with()
+
+    def test_key_from_arguments(self):
+        square = cached(lambda n: f"square:{n}", timeout=60)(lambda n: n * n)
+
+        assert square(3) == 9
+        assert square(4) == 16
+        assert cache.get("square:3")[0] == 9
+
+    def test_caches_none(self):
+        compute = Mock(return_value=None)
+
+        get_or_compute("nothing", compute, timeout=60)
+        get_or_compute("nothing", compute, timeout=60)
+
+        compute.assert_called_once_with()
+
+    @patch("{{ cookiecutter.project_slug }}.utils.cache.random.random", lambda: 0.5)
+    def test_refreshes_early_near_expiry(self):
+        # Took 10s to compute and expires in 1s: 10 * ln(0.5) is well past that.
+        cache.set("slow", ("old", 10.0, time.time() + 1), 60)
+
+        assert get_or_compute("slow", lambda: "new", timeout=60) == "new"
+
+    def test_no_early_refresh_with_zero_beta(self):
+        cache.set("slow", ("old", 10.0, time.time() + 1), 60)
+
+        assert get_or_compute("slow", lambda: "new", timeout=60, beta=0) == "old"
+
+    def test_serves_stale_while_another_process_computes(self):
+        cache.set("slow", ("old", 10.0, time.time() + 1), 60)
+        cache.add("slow:lock", 1, 10)
+
+        assert get_or_compute("slow", lambda: "new", timeout=60) == "old"
+
+    def test_single_flight(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(get_or_compute("hot", compute, 60))
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["value"] * 5
+        assert len(calls) == 1
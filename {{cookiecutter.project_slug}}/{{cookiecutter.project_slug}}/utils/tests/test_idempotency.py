@@ -0,0 +1,87 @@
+import time
+from typing import Iterator
+from unittest.mock import Mock
+
+import fakeredis
+import pytest
+from celery.result import AsyncResult, EagerResult
+
+from config import celery_app
+from {{ cookiecutter.project_slug }}.utils.idempotency import IdempotentTask, idempotency_key
+
+calls = Mock()
+
+
+@celery_app.task(
+    base=IdempotentTask, ignore_result=False, result_window=60, shared=False
+)
+def add(x, y):
+    calls(x, y)
+    return x + y
+
+
+@pytest.fixture(autouse=True)
+def redis(settings, monkeypatch) -> Iterator[fakeredis.FakeStrictRedis]:
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    redis = fakeredis.FakeStrictRedis()
+    monkeypatch.setattr(add, "redis", redis)
+    calls.reset_mock()
+    yield redis
+    redis.flushall()
+
+
+def test_idempotency_key():
+    assert idempotency_key("add", [1], {"b": 2, "a": 1}) == idempotency_key(
+        "add", (1,), {"a": 1, "b": 2}
+    )
+    assert idempotency_key("add", [1], {}) != idempotency_key("add", [2], {})
+
+
+def test_result_is_reused(redis):
+    assert add.delay(1, 2).get() == 3
+    result = add.delay(1, 2)
+
+    assert isinstance(result, EagerResult)
+    assert result.get() == 3
+    calls.assert_called_once_with(1, 2)
+    assert add.delay(2, 2).get() == 4
+    assert calls.call_count == 2
+
+
+def test_duplicates_merge_into_queued_task(redis):
+    queued_key, lock_key, result_key = add.keys((1, 2), {})
+    redis.set(queued_key, "queued-task-id")
+
+    result = add.delay(1, 2)
+
+    assert isinstance(result, AsyncResult)
+    assert result.id == "queued-task-id"
+    calls.assert_not_called()
+
+
+def test_skipped_while_running(redis):
+    queued_key, lock_key, result_key = add.keys((1, 2), {})
+    redis.lock(lock_key, timeout=60).acquire()
+
+    assert add.delay(1, 2).get() is None
+
+    calls.assert_not_called()
+    assert not redis.exists(queued_key)
+
+
+def test_lease_is_renewed(redis, monkeypatch):
+    monkeypatch.setattr(add, "lease", 0.3)
+    lock_key = add.keys((1, 2), {})[1]
+
+    def slow_add(x, y):
+        # Long enough for the lock to expire without renewal.
+        time.sleep(0.5)
+        assert redis.exists(lock_key)
+
+    calls.side_effect = slow_add
+    try:
+        assert add.delay(1, 2).get() == 3
+    finally:
+        calls.side_effect = None
+
+    assert not redis.exists(lock_key)
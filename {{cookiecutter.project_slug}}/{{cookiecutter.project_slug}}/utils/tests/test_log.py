@@ -0,0 +1,165 @@
+import json
+import logging
+import sys
+import threading
+from typing import List
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils.functional import SimpleLazyObject, empty
+
+from {{ cookiecutter.project_slug }}.users.models import User
+from {{ cookiecutter.project_slug }}.utils.log import (
+    JSONFormatter,
+    QueueHandler,
+    RequestContextFilter,
+    RequestContextMiddleware,
+)
+
+
+def log_in_view(request_factory: RequestFactory, user, **headers):
+    records: List[logging.LogRecord] = []
+
+    def view(request):
+        record = logging.makeLogRecord({"msg": "In the view"})
+        RequestContextFilter().filter(record)
+        records.append(record)
+        return HttpResponse()
+
+    request = request_factory.get("/", **headers)
+    request.user = user
+    response = RequestContextMiddleware(view)(request)
+    return response, records[0]
+
+
+class TestRequestContext:
+    @pytest.mark.django_db
+    def test_new_request_id(self, request_factory: RequestFactory, user: User):
+        response, record = log_in_view(request_factory, user)
+
+        assert len(record.request_id) == 32
+        assert response["X-Request-ID"] == record.request_id
+        assert record.user_id == user.pk
+        assert 0 <= record.elapsed < 1
+
+    def test_request_id_from_header(self, request_factory: RequestFactory):
+        response, record = log_in_view(
+            request_factory, AnonymousUser(), HTTP_X_REQUEST_ID="abc-123"
+        )
+
+        assert record.request_id == response["X-Request-ID"] == "abc-123"
+        assert record.user_id is None
+
+    def test_invalid_request_id_replaced(self, request_factory: RequestFactory):
+        response, record = log_in_view(
+            request_factory, AnonymousUser(), HTTP_X_REQUEST_ID="<script>" * 10
+        )
+
+        assert record.request_id == response["X-Request-ID"] != "<script>" * 10
+
+    def test_outside_requests(self):
+        record = logging.makeLogRecord({"msg": "Outside"})
+
+        assert RequestContextFilter().filter(record)
+        assert getattr(record, "request_id") is None
+
+
+def test_json_formatter():
+    try:
+        raise ValueError("Boom")
+    except ValueError:
+        record = logging.getLogger("test").makeRecord(
+            "test", logging.ERROR, __file__, 1, "Failed %s", ("job",), sys.exc_info()
+        )
+
+    data = json.loads(JSONFormatter().format(record))
+
+    assert data["level"] == "ERROR"
+    assert data["logger"] == "test"
+    assert data["message"] == "Failed job"
+    assert data["request_id"] is None
+    assert "ValueError: Boom" in data["exception"]
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_queue_handler():
+    target = ListHandler()
+    handler = QueueHandler([target])
+    logger = logging.getLogger("test.queue")
+    logger.addHandler(handler)
+    try:
+        try:
+            raise ValueError("Boom")
+        except ValueError:
+            logger.exception("Failed %s", "job")
+    finally:
+        logger.removeHandler(handler)
+        handler.stop()
+
+    [record] = target.records
+    assert record.getMessage() == "Failed job"
+    assert record.exc_info and record.exc_info[0] is ValueError
+
+
+def test_queue_handler_loads_user_before_queueing(request_factory: RequestFactory):
+    request = request_factory.get("/")
+    user = SimpleLazyObject(AnonymousUser)
+    setattr(request, "user", user)
+    handler = QueueHandler([ListHandler()])
+    try:
+        record = logging.makeLogRecord({"msg": "Failed", "request": request})
+
+        handler.prepare(record)
+    finally:
+        handler.stop()
+
+    assert getattr(user, "_wrapped") is not empty
+
+
+class BlockedHandler(ListHandler):
+    def __init__(self):
+        super().__init__()
+        self.unblocked = threading.Event()
+
+    def emit(self, record):
+        self.unblocked.wait()
+        super().emit(record)
+
+
+def test_queue_handler_drops_when_full():
+    target = BlockedHandler()
+    handler = QueueHandler([target], queue_size=2)
+    logger = logging.getLogger("test.queue.full")
+    logger.addHandler(handler)
+    try:
+        for n in range(10):
+            logger.warning("Record %d", n)
+        assert handler.dropped >= 7
+        target.unblocked.set()
+        handler.queue.join()
+        logger.warning("Last")
+    finally:
+        logger.removeHandler(handler)
+        handler.stop()
+
+    messages = [record.getMessage() for record in target.records]
+    assert messages[-2:] == [
+        f"Dropped {handler.dropped} log records, the logging queue was full",
+        "Last",
+    ]
+
+
+def test_logging_settings():
+    [handler] = [h for h in logging.getLogger().handlers if isinstance(h, QueueHandler)]
+
+    assert [type(target) for target in handler.handlers] == [logging.StreamHandler]
@@ -0,0 +1,96 @@
+import smtplib
+import time
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives, send_mail
+
+from {{ cookiecutter.project_slug }}.utils import mail as async_mail
+
+
+@pytest.fixture
+def async_backend(settings, monkeypatch):
+    settings.EMAIL_BACKEND = "{{ cookiecutter.project_slug }}.utils.mail.AsyncEmailBackend"
+    settings.ASYNC_EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    monkeypatch.setattr(async_mail, "_celery_task", lambda: None)
+
+
+def test_serialize_round_trip():
+    message = EmailMultiAlternatives(
+        "Subject", "Body", "from@example.com", ["to@example.com"], bcc=["b@example.com"]
+    )
+    message.attach_alternative("<p>Body</p>", "text/html")
+    message.attach("notes.txt", "text", "text/plain")
+    message.attach("data.bin", b"\x00\xff", "application/octet-stream")
+
+    copy = async_mail.deserialize_message(async_mail.serialize_message(message))
+
+    assert copy.recipients() == message.recipients()
+    assert copy.alternatives == [("<p>Body</p>", "text/html")]
+    assert copy.attachments == message.attachments
+
+
+def test_thread_pool_delivery(async_backend):
+    sent = send_mail("Subject", "Body", "from@example.com", ["to@example.com"])
+
+    assert sent == 1
+    assert async_mail.get_outbox().join(timeout=5)
+    assert [message.subject for message in mail.outbox] == ["Subject"]
+
+
+class FakeSMTP(smtplib.SMTP):
+    def __init__(self):
+        super().__init__()
+        self.alive = True
+        self.quit_called = False
+
+    def noop(self):
+        if not self.alive:
+            raise smtplib.SMTPServerDisconnected()
+        return (250, b"OK")
+
+    def quit(self):
+        self.quit_called = True
+
+    def close(self):
+        pass
+
+
+class TestSMTPConnectionPool:
+    def test_reuses_connections(self):
+        pool = async_mail.SMTPConnectionPool(size=2)
+
+        first = pool.acquire(FakeSMTP)
+        pool.release(first)
+
+        assert pool.acquire(FakeSMTP) is first
+        assert pool.open_connections == 1
+
+    def test_bounded(self):
+        pool = async_mail.SMTPConnectionPool(size=1)
+        pool.acquire(FakeSMTP)
+
+        with pytest.raises(smtplib.SMTPServerDisconnected):
+            pool.acquire(FakeSMTP, timeout=0.01)
+
+    def test_replaces_dead_idle_connection(self):
+        pool = async_mail.SMTPConnectionPool(size=1, check_after=0)
+        dead = FakeSMTP()
+        pool.release(pool.acquire(lambda: dead))
+        dead.alive = False
+        time.sleep(0.001)
+
+        connection = pool.acquire(FakeSMTP)
+
+        assert connection is not dead
+        assert dead.quit_called
+        assert pool.open_connections == 1
+
+    def test_unhealthy_release_frees_slot(self):
+        pool = async_mail.SMTPConnectionPool(size=1)
+        broken = FakeSMTP()
+
+        pool.release(pool.acquire(lambda: broken), healthy=False)
+
+        assert pool.open_connections == 0
+        assert pool.acquire(FakeSMTP, timeout=0.01) is not broken
@@ -0,0 +1,101 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from django_redis.client import DefaultClient
+from prometheus_client import REGISTRY
+
+from config import gunicorn
+from {{ cookiecutter.project_slug }}.users.models import User
+from {{ cookiecutter.project_slug }}.utils.metrics import (
+    InstrumentedRedisClient,
+    RequestStats,
+    _stats,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def sample(name: str, view: str, method: str = "GET") -> float:
+    return REGISTRY.get_sample_value(name, {"view": view, "method": method}) or 0
+
+
+class TestRequestMetricsMiddleware:
+    def test_records_per_url_name(self, client: Client, user: User):
+        client.force_login(user)
+        requests = sample("django_request_duration_seconds_count", "users:detail")
+        queries = sample("django_request_db_queries_sum", "users:detail")
+        size = sample("django_response_size_bytes_sum", "users:detail")
+
+        response = client.get(reverse("users:detail", args=[user.username]))
+
+        assert (
+            sample("django_request_duration_seconds_count", "users:detail")
+            == requests + 1
+        )
+        assert sample("django_request_db_queries_sum", "users:detail") > queries
+        assert sample("django_response_size_bytes_sum", "users:detail") == size + len(
+            response.content
+        )
+
+    def test_unresolved(self, client: Client):
+        requests = sample("django_request_duration_seconds_count", "<unresolved>")
+
+        client.get("/no-such-page/")
+
+        assert (
+            sample("django_request_duration_seconds_count", "<unresolved>")
+            == requests + 1
+        )
+
+
+class TestMetricsView:
+    def test_off_without_token(self, client: Client):
+        assert client.get(reverse("metrics")).status_code == 404
+
+    def test_wrong_token(self, client: Client, settings):
+        settings.METRICS_TOKEN = "secret"
+
+        response = client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer guess")
+
+        assert response.status_code == 404
+
+    def test_metrics(self, client: Client, settings):
+        settings.METRICS_TOKEN = "secret"
+        client.get(reverse("home"))
+
+        response = client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+
+        assert response.status_code == 200
+        assert b'django_request_duration_seconds_count{method="GET",view="home"}' in (
+            response.content
+        )
+
+
+def test_gunicorn_marks_dead_workers(monkeypatch, tmp_path):
+    monkeypatch.setenv("prometheus_multiproc_dir", str(tmp_path))
+
+    with patch("prometheus_client.multiprocess.mark_process_dead") as mark:
+        gunicorn.child_exit(Mock(), Mock(pid=123))
+
+    mark.assert_called_once_with(123)
+
+
+def test_cache_hits_and_misses():
+    client = InstrumentedRedisClient("redis://localhost:6379", {}, Mock())
+    stats = RequestStats()
+    token = _stats.set(stats)
+    try:
+        with patch.object(DefaultClient, "get", return_value=1):
+            assert client.get("hit") == 1
+        with patch.object(
+            DefaultClient, "get", side_effect=lambda key, default, **_: default
+        ):
+            assert client.get("miss", "default") == "default"
+        with patch.object(DefaultClient, "get_many", return_value={"a": 1}):
+            assert client.get_many(["a", "b", "c"]) == {"a": 1}
+    finally:
+        _stats.reset(token)
+
+    assert (stats.cache_hits, stats.cache_misses) == (2, 3)
@@ -0,0 +1,122 @@
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from {{ cookiecutter.project_slug }}.utils.profiler import (
+    Profile,
+    ProfilerMiddleware,
+    make_token,
+    save,
+)
+
+
+def busy_view(request):
+    end = time.perf_counter() + 0.05
+    while time.perf_counter() < end:
+        pass
+    return HttpResponse()
+
+
+@pytest.fixture
+def profiler_settings(settings, tmp_path: Path):
+    settings.PROFILER_DIR = str(tmp_path)
+    settings.PROFILER_INTERVAL = 0.001
+    settings.PROFILER_SAMPLE_RATE = 0
+    settings.PROFILER_LATENCY_THRESHOLD = 0
+    return settings
+
+
+def profiles(settings):
+    return list(Path(settings.PROFILER_DIR).glob("*.folded"))
+
+
+class TestProfilerMiddleware:
+    def test_off(self, request_factory: RequestFactory, profiler_settings):
+        ProfilerMiddleware(busy_view)(request_factory.get("/"))
+
+        assert profiles(profiler_settings) == []
+
+    def test_signed_header(self, request_factory: RequestFactory, profiler_settings):
+        request = request_factory.get("/", HTTP_X_PROFILE=make_token())
+
+        ProfilerMiddleware(busy_view)(request)
+
+        [path] = profiles(profiler_settings)
+        lines = path.read_text().splitlines()
+        assert lines
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0
+        assert any(
+            line.split(" ")[0].endswith(f"{__name__}:busy_view") for line in lines
+        )
+
+    def test_bad_signature(self, request_factory: RequestFactory, profiler_settings):
+        request = request_factory.get("/", HTTP_X_PROFILE=make_token() + "x")
+
+        ProfilerMiddleware(busy_view)(request)
+
+        assert profiles(profiler_settings) == []
+
+    def test_sample_rate(self, request_factory: RequestFactory, profiler_settings):
+        profiler_settings.PROFILER_SAMPLE_RATE = 1
+
+        ProfilerMiddleware(busy_view)(request_factory.get("/"))
+
+        assert len(profiles(profiler_settings)) == 1
+
+    def test_latency_threshold(
+        self, request_factory: RequestFactory, profiler_settings
+    ):
+        profiler_settings.PROFILER_LATENCY_THRESHOLD = 0.01
+
+        ProfilerMiddleware(lambda request: HttpResponse())(request_factory.get("/"))
+        assert profiles(profiler_settings) == []
+
+        ProfilerMiddleware(busy_view)(request_factory.get("/"))
+        assert len(profiles(profiler_settings)) == 1
+
+
+def test_save_deletes_oldest(profiler_settings):
+    profile = Profile(sample_after=0)
+    profile.stacks["app:main;app:view"] = 10
+    size = len(profile.collapsed())
+    profiler_settings.PROFILER_MAX_BYTES = size * 2
+
+    first = save(profile, "first")
+    second = save(profile, "second")
+    third = save(profile, "third")
+
+    assert first and not first.exists()
+    assert second and second.exists()
+    assert third and third.exists()
+
+    profiler_settings.PROFILER_MAX_BYTES = size - 1
+    assert save(profile, "too-big") is None
+
+
+def test_save_tolerates_files_pruned_elsewhere(profiler_settings):
+    profile = Profile(sample_after=0)
+    profile.stacks["app:main"] = 1
+    profiler_settings.PROFILER_MAX_BYTES = len(profile.collapsed())
+    first = save(profile, "first")
+    assert first
+
+    with patch.object(Path, "unlink", side_effect=FileNotFoundError):
+        assert save(profile, "second")
+
+
+def test_save_errors_do_not_fail_the_request(
+    request_factory: RequestFactory, profiler_settings, caplog
+):
+    profiler_settings.PROFILER_SAMPLE_RATE = 1
+
+    with patch(f"{save.__module__}.save", side_effect=OSError("No space")):
+        response = ProfilerMiddleware(busy_view)(request_factory.get("/"))
+
+    assert response.status_code == 200
+    assert "Could not save the profile of /" in caplog.text
@@ -0,0 +1,58 @@
+from unittest.mock import Mock
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from {{ cookiecutter.project_slug }}.users.models import User
+from {{ cookiecutter.project_slug }}.utils.query_budget import (
+    QueryBudgetExceeded,
+    QueryBudgetMiddleware,
+    fingerprint,
+    get_query_budget,
+    query_budget,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@query_budget(2)
+def list_users_view(request):
+    # Deliberately N+1: one query for the ids, one per user.
+    for pk in User.objects.values_list("pk", flat=True):
+        User.objects.get(pk=pk)
+    return HttpResponse()
+
+
+def _run(request, view):
+    middleware = QueryBudgetMiddleware(lambda request: view(request))
+    middleware.process_view(request, view, (), {})
+    return middleware(request)
+
+
+def test_fingerprint_groups_literals():
+    assert fingerprint("SELECT 1 FROM t WHERE id IN (%s, %s) AND x = 'a'") == (
+        "SELECT ? FROM t WHERE id IN (...) AND x = ?"
+    )
+
+
+def test_get_query_budget_by_action():
+    view = Mock(query_budget={"list": 2, "post": 5}, actions={"get": "list"})
+
+    assert get_query_budget(view, "GET") == 2
+    assert get_query_budget(view, "POST") == 5
+    assert get_query_budget(view, "DELETE") is None
+
+
+def test_within_budget(user: User, request_factory: RequestFactory):
+    assert _run(request_factory.get("/"), list_users_view).status_code == 200
+
+
+def test_over_budget(user: User, request_factory: RequestFactory):
+    User.objects.create(username="another")
+
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        _run(request_factory.get("/"), list_users_view)
+
+    assert "ran 3 queries" in str(excinfo.value)
+    assert "2x SELECT" in str(excinfo.value)
@@ -0,0 +1,62 @@
+from unittest.mock import patch
+
+from django.test import RequestFactory
+
+from {{ cookiecutter.project_slug }}.utils.ratelimit import (
+    MemoryRateLimiter,
+    client_ip,
+    parse_rate,
+)
+
+
+class TestParseRate:
+    def test_parse(self):
+        assert parse_rate("5/m") == (5, 60)
+        assert parse_rate("100/hour") == (100, 3600)
+
+
+class TestMemoryRateLimiter:
+    def test_burst_then_refused(self):
+        limiter = MemoryRateLimiter()
+        with patch("time.time", return_value=1000.0):
+            results = [limiter.hit("key", 3, 60) for _ in range(4)]
+
+        assert [result.allowed for result in results] == [True, True, True, False]
+        assert results[2].remaining == 0
+        assert results[3].retry_after == 20
+
+    def test_refills(self):
+        limiter = MemoryRateLimiter()
+        with patch("time.time", return_value=1000.0):
+            for _ in range(3):
+                limiter.hit("key", 3, 60)
+            assert not limiter.hit("key", 3, 60).allowed
+
+        with patch("time.time", return_value=1020.0):
+            assert limiter.hit("key", 3, 60).allowed
+            assert not limiter.hit("key", 3, 60).allowed
+
+    def test_keys_are_independent(self):
+        limiter = MemoryRateLimiter()
+        limiter.hit("a", 1, 60)
+
+        assert not limiter.hit("a", 1, 60).allowed
+        assert limiter.hit("b", 1, 60).allowed
+
+
+class TestClientIP:
+    def test_remote_addr(self, settings, request_factory: RequestFactory):
+        settings.RATELIMIT_NUM_PROXIES = 0
+        request = request_factory.get(
+            "/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="192.0.2.1"
+        )
+
+        assert client_ip(request) == "10.0.0.1"
+
+    def test_trusted_proxy(self, settings, request_factory: RequestFactory):
+        settings.RATELIMIT_NUM_PROXIES = 1
+        request = request_factory.get(
+            "/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="spoofed, 192.0.2.1"
+        )
+
+        assert client_ip(request) == "192.0.2.1"